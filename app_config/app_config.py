@@ -24,6 +24,9 @@ AUTHOR = "Marco Polo"
 APP_DEVELOPER  = "PatronHub"
 APP_VERSION = "1.0.0"
 
+# Number of conversions kept in the history
+HISTORY_CAPACITY = int(os.getenv("HISTORY_CAPACITY") or 5000)
+
 MAYA_QR_FILE = os.getenv("MAYA_QR_FILE", "")
 COPYRIGHT = f"© 2025 {APP_NAME}. All rights reserved."
 
@@ -0,0 +1,418 @@
+# benchmarks/bench_core.py
+
+"""
+Benchmark suite for core/unit_conversion.py.
+
+Measures UnitConverterCore operations for every category in unit_mappings,
+as scalar calls and as batch workloads, and emits machine-readable JSON
+(ops/sec, p50/p99 latency, peak traced memory) for comparison between runs.
+Throughput is timed over batches of calls, latency (p50/p99) over single
+calls. Every statistic is the median over several rounds, each run in its
+own worker process, so a disturbed round does not skew it.
+
+    python -m benchmarks.bench_core -o bench.json
+    python -m benchmarks.bench_core --sizes scalar,1e3,1e6,1e8 --filter Distance
+    python -m benchmarks.bench_core --baseline baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from statistics import median
+
+import numpy as np
+
+from benchmarks.compare import (
+    DEFAULT_MAX_P99_INCREASE, DEFAULT_MAX_THROUGHPUT_DROP, compare_reports, comparison_status, format_comparison
+)
+from core.unit_conversion import UnitConverterCore
+
+SIZES = {"scalar": 0, "1e3": 10**3, "1e6": 10**6, "1e8": 10**8}
+DEFAULT_SIZES = "scalar,1e3,1e6"
+DEFAULT_MIN_TIME = 1.0
+DEFAULT_REPEATS = 5
+DEFAULT_RECHECKS = 1
+TARGET_BATCH_NS = 200_000
+MAX_BATCH_SIZE = 1 << 20
+LATENCY_SAMPLES = 2000
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Benchmark:
+    """One measured operation: a zero-argument callable plus its labels"""
+
+    __slots__ = ("name", "operation", "category", "size", "func")
+
+    def __init__(self, operation, category, size, func):
+        self.operation = operation
+        self.category = category
+        self.size = size
+        self.func = func
+        label = "scalar" if size == 0 else f"{size:.0e}".replace("+0", "").replace("+", "")
+        self.name = f"{operation}[{category}:{label}]"
+
+
+def build_benchmarks(converter, sizes, name_filter=None):
+    """
+    Builds the benchmark list for every category and requested size.
+
+    Scalar workloads cover convert_units, convert_temperature and
+    get_units_for_type; array workloads cover convert_many,
+    convert_threaded and the vectorized convert_temperature path.
+    """
+    benchmarks = []
+    arrays = {size: np.linspace(-1000.0, 1000.0, size) for size in sizes if size}
+
+    for category in converter.unit_mappings:
+        units = converter.get_units_for_type(category)
+        from_unit, to_unit = units[0], units[-1]
+
+        for size in sizes:
+            if size == 0:
+                benchmarks.append(Benchmark(
+                    "convert_units", category, 0,
+                    lambda c=category, f=from_unit, t=to_unit: converter.convert_units(123.456, f, t, c)))
+                benchmarks.append(Benchmark(
+                    "get_units_for_type", category, 0,
+                    lambda c=category: converter.get_units_for_type(c)))
+                if category == "Temperature":
+                    benchmarks.append(Benchmark(
+                        "convert_temperature", category, 0,
+                        lambda f=from_unit, t=to_unit: converter.convert_temperature(123.456, f, t)))
+            else:
+                values = arrays[size]
+                benchmarks.append(Benchmark(
+                    "convert_many", category, size,
+                    lambda v=values, c=category, f=from_unit, t=to_unit: converter.convert_many(v, f, t, c)))
+                benchmarks.append(Benchmark(
+                    "convert_threaded", category, size,
+                    lambda v=values, c=category, f=from_unit, t=to_unit: converter.convert_threaded(v, f, t, c)))
+                if category == "Temperature":
+                    benchmarks.append(Benchmark(
+                        "convert_temperature", category, size,
+                        lambda v=values, f=from_unit, t=to_unit: converter.convert_temperature(v, f, t)))
+
+    if name_filter:
+        benchmarks = [b for b in benchmarks if name_filter in b.name]
+    return benchmarks
+
+
+def calibrate(rounds=3, iterations=20_000):
+    """
+    Times a fixed reference workload to estimate the machine's speed.
+
+    The workload mixes interpreter work (dict lookups, float arithmetic,
+    string formatting) with a small NumPy kernel, like the conversion core.
+    Returns the fastest round in nanoseconds.
+    """
+    table = {f"unit{i}": float(i + 1) for i in range(16)}
+    names = list(table)
+    array = np.linspace(0.0, 1.0, 4096)
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        total = 0.0
+        for i in range(iterations):
+            name = names[i & 15]
+            total += i * table[name] / table[names[(i + 3) & 15]]
+            if not i & 255:
+                f"{total:,.4f}"
+                array * total + 1.0
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _percentile(sorted_samples, fraction):
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def batch_size(func, target_ns=TARGET_BATCH_NS):
+    """
+    Finds how many calls one timed sample needs to take at least target_ns.
+
+    Microsecond-scale calls are too short to time one by one (clock
+    resolution and call overhead dominate), so each sample times a batch.
+    """
+    number = 1
+    while number < MAX_BATCH_SIZE:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            func()
+        if time.perf_counter_ns() - start >= target_ns:
+            break
+        number *= 2
+    return min(number, MAX_BATCH_SIZE)
+
+
+def time_batches(func, number, min_time):
+    """Times batches of number calls for min_time seconds; returns ns per call of each batch"""
+    samples = []
+    clock = time.perf_counter_ns
+    deadline = clock() + int(min_time * 1e9)
+    while not samples or clock() < deadline:
+        start = clock()
+        for _ in range(number):
+            func()
+        samples.append((clock() - start) / number)
+    return samples
+
+
+def time_calls(func, count, min_time):
+    """Times up to count single calls (fewer if min_time runs out); returns ns of each call"""
+    samples = []
+    clock = time.perf_counter_ns
+    deadline = clock() + int(min_time * 1e9)
+    while len(samples) < count and (not samples or clock() < deadline):
+        start = clock()
+        func()
+        samples.append(clock() - start)
+    return samples
+
+
+def peak_memory(func):
+    """Peak traced memory of one call, measured apart from the timings"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def _noise(values):
+    """Half the relative range of per-round values: how much the rounds disagree"""
+    center = median(values)
+    return (max(values) - min(values)) / (2 * center) if center else 0.0
+
+
+def run_round(benchmarks, min_time, progress=None):
+    """
+    Times every benchmark once, in this process.
+
+    Each benchmark gets min_time seconds: half on batches of calls for
+    throughput, half on single calls for latency, right after a calibration
+    run. Returns one dict of statistics per benchmark, keyed by name.
+    """
+    stats = {}
+    for benchmark in benchmarks:
+        if progress:
+            progress(benchmark.name)
+        benchmark.func()  # warm-up (plan caches, page faults)
+        number = batch_size(benchmark.func)
+        calibration_ns = calibrate()
+        batches = time_batches(benchmark.func, number, min_time / 2)
+        calls = sorted(time_calls(benchmark.func, LATENCY_SAMPLES, min_time / 2))
+        stats[benchmark.name] = {
+            "calibration_ns": calibration_ns,
+            "batch_size": number,
+            "batches": len(batches),
+            "batch_mean_ns": median(batches),
+            "samples": len(calls),
+            "p50_ns": _percentile(calls, 0.50),
+            "p99_ns": _percentile(calls, 0.99),
+        }
+    return stats
+
+
+def summarize(benchmark, rounds, calibration_ns, peak):
+    """
+    Reduces the rounds of one benchmark to its report entry.
+
+    Each round is rescaled by the calibration measured right before it,
+    relative to calibration_ns, then the median over rounds is reported,
+    so one disturbed round does not move the result. The per-round values
+    are kept (*_rounds) for the regression gate, and how far they disagree
+    is reported as *_noise.
+    """
+    scales = [calibration_ns / stats["calibration_ns"] for stats in rounds]
+    batch_means = [stats["batch_mean_ns"] * scale for stats, scale in zip(rounds, scales)]
+    p50s = [stats["p50_ns"] * scale for stats, scale in zip(rounds, scales)]
+    p99s = [stats["p99_ns"] * scale for stats, scale in zip(rounds, scales)]
+    mean_ns = median(batch_means)
+    ops_per_sec = 1e9 / mean_ns if mean_ns else float("inf")
+    return {
+        "name": benchmark.name,
+        "operation": benchmark.operation,
+        "category": benchmark.category,
+        "size": benchmark.size,
+        "batch_size": int(median(stats["batch_size"] for stats in rounds)),
+        "repeats": len(rounds),
+        "batches": sum(stats["batches"] for stats in rounds),
+        "samples": sum(stats["samples"] for stats in rounds),
+        "ops_per_sec": ops_per_sec,
+        "ops_per_sec_rounds": [1e9 / ns if ns else float("inf") for ns in batch_means],
+        "ops_per_sec_noise": _noise(batch_means),
+        "elements_per_sec": ops_per_sec * max(benchmark.size, 1),
+        "p50_ns": median(p50s),
+        "p99_ns": median(p99s),
+        "p99_ns_rounds": p99s,
+        "p99_noise": _noise(p99s),
+        "peak_memory_bytes": peak,
+    }
+
+
+def _run_worker(sizes, min_time, name_filter, names, quiet):
+    """Run one round in a fresh interpreter and return its statistics"""
+    labels = {size: label for label, size in SIZES.items()}
+    command = [sys.executable, "-m", "benchmarks.bench_core", "--worker",
+               "--sizes", ",".join(labels[size] for size in sizes), "--min-time", repr(min_time)]
+    if name_filter:
+        command += ["--filter", name_filter]
+    for name in names or ():
+        command += ["--name", name]
+    if quiet:
+        command.append("--quiet")
+    # stderr is inherited, so the worker's progress shows up as it runs
+    completed = subprocess.run(command, cwd=PROJECT_ROOT, stdout=subprocess.PIPE, check=True)
+    return json.loads(completed.stdout)
+
+
+def run_rounds(sizes, min_time=DEFAULT_MIN_TIME, name_filter=None, progress=None,
+               repeats=DEFAULT_REPEATS, names=None):
+    """
+    Times repeats rounds, each in its own worker process and each spending
+    min_time / repeats seconds per benchmark, and returns their statistics.
+
+    Timings differ between processes (memory layout, hash seeds) as much as
+    over time, so only rounds in separate processes show how much a result
+    really varies. names restricts the rounds to those benchmarks.
+    """
+    if repeats < 1:
+        raise ValueError("repeats must be at least 1")
+    rounds = []
+    for round_index in range(repeats):
+        if progress:
+            progress(f"round {round_index + 1}/{repeats}")
+        rounds.append(_run_worker(sizes, min_time / repeats, name_filter, names, progress is None))
+    return rounds
+
+
+def build_report(sizes, rounds, min_time=DEFAULT_MIN_TIME, name_filter=None, repeats=DEFAULT_REPEATS):
+    """
+    Builds the JSON-serializable report from the rounds of run_rounds.
+
+    A benchmark is summarized over every round that timed it, so rounds
+    from a recheck are pooled with the first ones.
+    """
+    benchmarks = build_benchmarks(UnitConverterCore(), sizes, name_filter)
+    calibrations = [stats["calibration_ns"] for stats_by_name in rounds for stats in stats_by_name.values()]
+    calibration_ns = median(calibrations) if calibrations else calibrate()
+    results = [summarize(benchmark, [stats_by_name[benchmark.name] for stats_by_name in rounds
+                                     if benchmark.name in stats_by_name],
+                         calibration_ns, peak_memory(benchmark.func))
+               for benchmark in benchmarks]
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "min_time": min_time,
+            "repeats": repeats,
+            "calibration_ns": calibration_ns,
+        },
+        "results": results,
+    }
+
+
+def run_suite(sizes, min_time=DEFAULT_MIN_TIME, name_filter=None, progress=None, repeats=DEFAULT_REPEATS):
+    """Runs every benchmark and returns the JSON-serializable report"""
+    rounds = run_rounds(sizes, min_time, name_filter, progress, repeats)
+    return build_report(sizes, rounds, min_time, name_filter, repeats)
+
+
+def parse_sizes(text):
+    sizes = []
+    for label in text.split(","):
+        label = label.strip()
+        if label not in SIZES:
+            raise argparse.ArgumentTypeError(f"Unknown size {label!r}, expected one of {', '.join(SIZES)}")
+        sizes.append(SIZES[label])
+    return sizes
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the unit conversion core")
+    parser.add_argument("-o", "--output", default="-", help="JSON report file (default: stdout)")
+    parser.add_argument("--sizes", type=parse_sizes, default=parse_sizes(DEFAULT_SIZES),
+                        help=f"Comma-separated workloads from {', '.join(SIZES)} (default: {DEFAULT_SIZES})")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help=f"Seconds spent timing each benchmark (default: {DEFAULT_MIN_TIME})")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS,
+                        help=f"Worker processes the timing is split into (default: {DEFAULT_REPEATS})")
+    parser.add_argument("--filter", default=None, help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--baseline", default=None,
+                        help="Compare against a stored report; exit 1 on regressions, 2 if inconclusive")
+    parser.add_argument("--max-throughput-drop", type=float, default=DEFAULT_MAX_THROUGHPUT_DROP,
+                        help=f"Allowed relative ops/sec loss (default: {DEFAULT_MAX_THROUGHPUT_DROP})")
+    parser.add_argument("--max-p99-increase", type=float, default=DEFAULT_MAX_P99_INCREASE,
+                        help=f"Allowed relative p99 growth (default: {DEFAULT_MAX_P99_INCREASE})")
+    parser.add_argument("--rechecks", type=int, default=DEFAULT_RECHECKS,
+                        help="With --baseline, times regressed or inconclusive benchmarks again this many "
+                             f"times, pooling the rounds, before the gate decides (default: {DEFAULT_RECHECKS})")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Do not print progress to stderr")
+    # Internal: time one round in this process and print its statistics as JSON
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--name", action="append", help=argparse.SUPPRESS)
+    return parser
+
+
+# -------------------- Main -------------------- #
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    progress = None if args.quiet else (lambda name: print(f"running {name}", file=sys.stderr))
+    if args.worker:
+        benchmarks = build_benchmarks(UnitConverterCore(), args.sizes, args.filter)
+        if args.name:
+            benchmarks = [benchmark for benchmark in benchmarks if benchmark.name in args.name]
+        json.dump(run_round(benchmarks, args.min_time, progress), sys.stdout)
+        return 0
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if args.filter:
+            # Benchmarks left out by --filter are not missing
+            baseline["results"] = [r for r in baseline.get("results", []) if args.filter in r["name"]]
+    rounds = run_rounds(args.sizes, args.min_time, args.filter, progress, args.repeats)
+    report = build_report(args.sizes, rounds, args.min_time, args.filter, args.repeats)
+
+    comparison = None
+    if baseline is not None:
+        comparison = compare_reports(baseline, report, args.max_throughput_drop, args.max_p99_increase)
+        for recheck in range(args.rechecks):
+            flagged = [row["name"] for row in comparison["regressions"] + comparison["inconclusive"]]
+            if not flagged:
+                break
+            if progress:
+                progress(f"recheck {recheck + 1}/{args.rechecks} of {len(flagged)} benchmark(s)")
+            rounds += run_rounds(args.sizes, args.min_time, args.filter, progress, args.repeats, flagged)
+            report = build_report(args.sizes, rounds, args.min_time, args.filter, args.repeats)
+            comparison = compare_reports(baseline, report, args.max_throughput_drop, args.max_p99_increase)
+
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+    if comparison is not None:
+        print(format_comparison(comparison), file=sys.stderr)
+        return comparison_status(comparison)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+# benchmarks/compare.py
+
+"""
+Performance regression gate for bench_core reports.
+
+Compares a current report against a stored baseline, normalizing for
+machine speed with the calibration loop recorded in each report, and fails
+when an operation loses more throughput or gains more p99 latency than
+allowed, or when a baseline benchmark is missing from the current report.
+A change past its limit is a regression only when every round of the
+current run is worse than every round of the baseline by more than the
+limit. Otherwise noise may widen the limit by at most the limit itself;
+a larger change the rounds cannot settle is reported as inconclusive, to
+rerun.
+
+    python -m benchmarks.compare baseline.json current.json --max-throughput-drop 0.05
+"""
+
+import argparse
+import json
+import sys
+
+DEFAULT_MAX_THROUGHPUT_DROP = 0.05
+DEFAULT_MAX_P99_INCREASE = 0.10
+
+# Exit status of the gate
+EXIT_OK, EXIT_FAILED, EXIT_INCONCLUSIVE = 0, 1, 2
+
+
+def classify_change(change, limit, separation):
+    """
+    Classify a relative change where positive is worse.
+
+    change compares the medians of the two runs; separation compares the
+    best current round with the worst baseline round, so it only passes
+    limit when the rounds of the two runs do not overlap. Returns "ok"
+    within limit, "regression" past limit with separated rounds, "ok" again
+    within twice limit (the noise allowance, capped at limit itself) and
+    "inconclusive" beyond that.
+    """
+    if change <= limit:
+        return "ok"
+    if separation > limit:
+        return "regression"
+    if change <= 2 * limit:
+        return "ok"
+    return "inconclusive"
+
+
+def _rounds(result, key, rounds_key):
+    """Per-round values of a result, or its summary value in older reports"""
+    return result.get(rounds_key) or [result[key]]
+
+
+def compare_reports(baseline, current, max_throughput_drop=DEFAULT_MAX_THROUGHPUT_DROP,
+                    max_p99_increase=DEFAULT_MAX_P99_INCREASE):
+    """
+    Compares two bench_core reports benchmark by benchmark.
+
+    Current numbers are rescaled by the ratio of the two calibration times,
+    so a uniformly slower machine does not count as a regression. Changes
+    are classified with classify_change from the medians and the per-round
+    values of both reports.
+
+    Returns:
+        dict: {"speed_ratio": float, "rows": [...], "regressions": [...],
+        "inconclusive": [...], "missing": [names only in the baseline],
+        "new": [names only in current]}.
+    """
+    base_cal = baseline.get("meta", {}).get("calibration_ns")
+    cur_cal = current.get("meta", {}).get("calibration_ns")
+    # > 1 means the current machine is slower than the baseline machine
+    speed_ratio = cur_cal / base_cal if base_cal and cur_cal else 1.0
+
+    base_results = {r["name"]: r for r in baseline.get("results", [])}
+    cur_results = {r["name"]: r for r in current.get("results", [])}
+
+    rows = []
+    regressions = []
+    inconclusive = []
+    for name, cur in cur_results.items():
+        base = base_results.get(name)
+        if base is None:
+            continue
+        ops = cur["ops_per_sec"] * speed_ratio
+        p99 = cur["p99_ns"] / speed_ratio
+        throughput_change = ops / base["ops_per_sec"] - 1.0 if base["ops_per_sec"] else 0.0
+        p99_change = p99 / base["p99_ns"] - 1.0 if base["p99_ns"] else 0.0
+
+        base_ops = min(_rounds(base, "ops_per_sec", "ops_per_sec_rounds"))
+        cur_ops = max(_rounds(cur, "ops_per_sec", "ops_per_sec_rounds")) * speed_ratio
+        base_p99 = max(_rounds(base, "p99_ns", "p99_ns_rounds"))
+        cur_p99 = min(_rounds(cur, "p99_ns", "p99_ns_rounds")) / speed_ratio
+        throughput_separation = 1.0 - cur_ops / base_ops if base_ops else 0.0
+        p99_separation = cur_p99 / base_p99 - 1.0 if base_p99 else 0.0
+
+        throughput_noise = base.get("ops_per_sec_noise", 0.0) + cur.get("ops_per_sec_noise", 0.0)
+        p99_noise = base.get("p99_noise", 0.0) + cur.get("p99_noise", 0.0)
+        # Throughput is classified as a loss, so a drop is a positive change
+        throughput_status = classify_change(-throughput_change, max_throughput_drop, throughput_separation)
+        p99_status = classify_change(p99_change, max_p99_increase, p99_separation)
+
+        reasons, doubts = [], []
+        for status, text in ((throughput_status, f"throughput {throughput_change:+.1%} "
+                                                 f"(limit -{max_throughput_drop:.0%}, noise {throughput_noise:.0%})"),
+                             (p99_status, f"p99 {p99_change:+.1%} "
+                                          f"(limit +{max_p99_increase:.0%}, noise {p99_noise:.0%})")):
+            if status == "regression":
+                reasons.append(text)
+            elif status == "inconclusive":
+                doubts.append(text)
+
+        row = {
+            "name": name,
+            "baseline_ops_per_sec": base["ops_per_sec"],
+            "normalized_ops_per_sec": ops,
+            "throughput_change": throughput_change,
+            "throughput_noise": throughput_noise,
+            "throughput_status": throughput_status,
+            "baseline_p99_ns": base["p99_ns"],
+            "normalized_p99_ns": p99,
+            "p99_change": p99_change,
+            "p99_noise": p99_noise,
+            "p99_status": p99_status,
+            "reasons": reasons,
+            "doubts": doubts,
+        }
+        rows.append(row)
+        if reasons:
+            regressions.append(row)
+        elif doubts:
+            inconclusive.append(row)
+
+    return {
+        "speed_ratio": speed_ratio,
+        "rows": rows,
+        "regressions": regressions,
+        "inconclusive": inconclusive,
+        "missing": sorted(set(base_results) - set(cur_results)),
+        "new": sorted(set(cur_results) - set(base_results)),
+    }
+
+
+def comparison_status(comparison):
+    """
+    Gate exit status: EXIT_FAILED for regressions or baseline benchmarks
+    that did not run, else EXIT_INCONCLUSIVE if a change past the capped
+    limit was not confirmed by every round (rerun to decide), else EXIT_OK.
+    """
+    if comparison["regressions"] or comparison["missing"]:
+        return EXIT_FAILED
+    if comparison["inconclusive"]:
+        return EXIT_INCONCLUSIVE
+    return EXIT_OK
+
+
+def format_comparison(comparison):
+    """Renders a comparison as a readable text table"""
+    lines = [f"Machine speed ratio (current/baseline calibration): {comparison['speed_ratio']:.3f}", ""]
+    width = max([len(row["name"]) for row in comparison["rows"]] + [9])
+    lines.append(f"{'benchmark':<{width}}  {'ops/sec':>14}  {'change':>8}  {'p99 ns':>12}  {'change':>8}")
+    for row in comparison["rows"]:
+        if row["reasons"]:
+            marker = "  REGRESSION: " + "; ".join(row["reasons"])
+        elif row["doubts"]:
+            marker = "  INCONCLUSIVE (rerun): " + "; ".join(row["doubts"])
+        else:
+            marker = ""
+        lines.append(f"{row['name']:<{width}}  {row['normalized_ops_per_sec']:>14,.0f}  "
+                     f"{row['throughput_change']:>+8.1%}  {row['normalized_p99_ns']:>12,.0f}  "
+                     f"{row['p99_change']:>+8.1%}{marker}")
+    if comparison["missing"]:
+        lines.append("")
+        lines.append("Missing from current run: " + ", ".join(comparison["missing"]))
+    if comparison["new"]:
+        lines.append("Not in baseline: " + ", ".join(comparison["new"]))
+    lines.append("")
+    count = len(comparison["regressions"])
+    lines.append(f"{count} regression(s) found" if count else "No regressions")
+    if comparison["inconclusive"]:
+        lines.append(f"{len(comparison['inconclusive'])} inconclusive benchmark(s): too noisy to tell, rerun")
+    if comparison["missing"]:
+        lines.append(f"{len(comparison['missing'])} baseline benchmark(s) missing")
+    return "\n".join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Compare two benchmark reports")
+    parser.add_argument("baseline", help="Stored baseline report (JSON)")
+    parser.add_argument("current", help="Current report (JSON)")
+    parser.add_argument("--max-throughput-drop", type=float, default=DEFAULT_MAX_THROUGHPUT_DROP,
+                        help=f"Allowed relative ops/sec loss (default: {DEFAULT_MAX_THROUGHPUT_DROP})")
+    parser.add_argument("--max-p99-increase", type=float, default=DEFAULT_MAX_P99_INCREASE,
+                        help=f"Allowed relative p99 growth (default: {DEFAULT_MAX_P99_INCREASE})")
+    return parser
+
+
+# -------------------- Main -------------------- #
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    comparison = compare_reports(baseline, current, args.max_throughput_drop, args.max_p99_increase)
+    print(format_comparison(comparison))
+    return comparison_status(comparison)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
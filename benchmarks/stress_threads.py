@@ -0,0 +1,168 @@
+# benchmarks/stress_threads.py
+
+"""
+Contention stress run for the thread-pool batch backend.
+
+Many caller threads hammer convert_threaded, convert_many and convert_units
+at once, some sharing one converter and some with their own. The shared
+registry's memo caches are swapped for write-guarded dicts after warm-up,
+so any write to shared state on the hot path fails the run, and every
+result is checked against a single-threaded reference. Batches alternate
+between a 1-D array and a transposed (non-contiguous) 2-D view of it.
+
+    python -m benchmarks.stress_threads
+    python -m benchmarks.stress_threads --threads 32 --iterations 200 --size 200000
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from core.unit_conversion import UnitConverterCore
+from core.unit_registry import get_registry
+
+PAIRS = (
+    ("m", "mi", "Distance"),
+    ("km", "nm", "Distance"),
+    ("Celsius", "Fahrenheit", "Temperature"),
+    ("KiB", "MB", None),
+    ("lb", "kg", None),
+)
+
+
+class GuardedDict(dict):
+    """dict that records (and rejects) writes while armed"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.armed = False
+        self.writes = []
+
+    def _check(self, operation, key=None):
+        if self.armed:
+            self.writes.append((operation, key, threading.current_thread().name))
+            raise RuntimeError(f"Shared cache {operation} on the hot path: {key!r}")
+
+    def __setitem__(self, key, value):
+        self._check("set", key)
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._check("delete", key)
+        super().__delitem__(key)
+
+    def clear(self):
+        self._check("clear")
+        super().clear()
+
+
+def guard_registry(registry):
+    """Replace the registry's memo caches with GuardedDicts; returns them"""
+    guards = {
+        "generated_units": GuardedDict(registry._generated_units),
+        "dimensions": GuardedDict(registry.dimensions._cache),
+        "expressions": GuardedDict(registry.expressions._cache),
+    }
+    registry._generated_units = guards["generated_units"]
+    registry.dimensions._cache = guards["dimensions"]
+    registry.expressions._cache = guards["expressions"]
+    return guards
+
+
+def run_stress(threads, iterations, size, workers):
+    """Run the stress workload; returns (failures, elapsed seconds, conversions)"""
+    registry = get_registry()
+    values = np.random.default_rng(0).uniform(-1e6, 1e6, size)
+    values[::97] = np.nan
+    # Fortran-ordered view of the same values: exercises N-D, non-contiguous input
+    grid = values[:size - size % 8].reshape(8, -1).T
+    batches = (values, grid)
+
+    # Single-threaded reference (also warms the prefixed unit memo)
+    reference = UnitConverterCore()
+    expected = {(pair, batch_index): reference.convert_many(batch, *pair)
+                for pair in PAIRS for batch_index, batch in enumerate(batches)}
+
+    guards = guard_registry(registry)
+    for guard in guards.values():
+        guard.armed = True
+
+    shared = UnitConverterCore()
+    failures = []
+    start_barrier = threading.Barrier(threads)
+    conversions = [0] * threads
+
+    def caller(index):
+        converter = shared if index % 2 else UnitConverterCore()
+        start_barrier.wait()
+        try:
+            for i in range(iterations):
+                pair = PAIRS[(index + i) % len(PAIRS)]
+                if i % 3 == 2:
+                    scalar = converter.convert_units(values[i % size], *pair)
+                    want = expected[pair, 0]["result"][i % size]
+                    if "error" in scalar or not (np.isnan(want) or scalar["result"] == want):
+                        failures.append(f"convert_units{pair} -> {scalar!r}")
+                    conversions[index] += 1
+                    continue
+                batch_index = (i // 3) % len(batches)
+                batch = batches[batch_index]
+                if i % 3 == 1:
+                    got = converter.convert_many(batch, *pair)
+                else:
+                    got = converter.convert_threaded(batch, *pair, workers=workers)
+                want = expected[pair, batch_index]
+                if not (np.array_equal(got["result"], want["result"], equal_nan=True)
+                        and np.array_equal(got["invalid"], want["invalid"])):
+                    failures.append(f"thread {index} iteration {i}: {pair} {batch.shape} mismatch")
+                conversions[index] += batch.size
+        except Exception as e:
+            failures.append(f"thread {index}: {type(e).__name__}: {e}")
+
+    callers = [threading.Thread(target=caller, args=(i,), name=f"caller-{i}") for i in range(threads)]
+    started = time.perf_counter()
+    for thread in callers:
+        thread.start()
+    for thread in callers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    for name, guard in guards.items():
+        guard.armed = False
+        failures.extend(f"{name}: {operation} {key!r} from {thread}" for operation, key, thread in guard.writes)
+    return failures, elapsed, sum(conversions)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stress the thread-pool batch backend under contention")
+    parser.add_argument("--threads", type=int, default=16, help="Concurrent caller threads")
+    parser.add_argument("--iterations", type=int, default=60, help="Conversions per caller thread")
+    parser.add_argument("--size", type=int, default=100_000, help="Values per batch")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Slices per convert_threaded call (default: all cores)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, "
+          f"{os.cpu_count()} cores, {args.threads} caller threads")
+
+    failures, elapsed, conversions = run_stress(args.threads, args.iterations, args.size, args.workers)
+    print(f"{conversions:,} values converted in {elapsed:.2f}s ({conversions / elapsed:,.0f} values/s)")
+    if failures:
+        for failure in failures[:20]:
+            print(f"FAIL {failure}")
+        print(f"{len(failures)} failure(s)")
+        return 1
+    print("OK: results match the single-threaded reference, no shared cache writes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
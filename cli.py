@@ -0,0 +1,138 @@
+#cli.py
+
+"""
+Headless command-line entry point for batch unit conversion.
+Does not import PyQt5, so it can run in pipelines and on servers.
+"""
+
+import argparse
+import asyncio
+import sys
+
+from core.file_conversion import (
+    BINARY_DTYPES, DEFAULT_CHUNK_SIZE, DEFAULT_WINDOW_SIZE,
+    convert_binary_file, convert_csv_stream, parse_column_spec
+)
+from core.parallel import DEFAULT_PARALLEL_CHUNK_SIZE, convert_binary_file_parallel
+from core.service import DEFAULT_BATCH_WINDOW, DEFAULT_MAX_BATCH_SIZE, ConversionService
+from core.unit_conversion import UnitConverterCore
+
+
+def _open_text(path, mode):
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    return open(path, mode, newline="", encoding="utf-8")
+
+
+def run_csv(args):
+    columns = [parse_column_spec(spec) for spec in args.column]
+    infile = _open_text(args.input, "r")
+    outfile = _open_text(args.output, "w")
+    try:
+        rows = convert_csv_stream(infile, outfile, columns,
+                                  converter=UnitConverterCore(),
+                                  conversion_type=args.type,
+                                  chunk_size=args.chunk_size,
+                                  delimiter=args.delimiter)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+    print(f"Converted {rows} rows", file=sys.stderr)
+
+
+def run_binary(args):
+    if args.workers == 1:
+        count = convert_binary_file(args.input, args.from_unit, args.to_unit,
+                                    dst_path=args.output,
+                                    conversion_type=args.type,
+                                    dtype=args.dtype,
+                                    window_size=args.window_size,
+                                    converter=UnitConverterCore())
+    else:
+        count = convert_binary_file_parallel(args.input, args.from_unit, args.to_unit,
+                                             dst_path=args.output,
+                                             conversion_type=args.type,
+                                             dtype=args.dtype,
+                                             workers=args.workers or None,
+                                             window_size=args.window_size,
+                                             chunk_size=args.chunk_size,
+                                             converter=UnitConverterCore())
+    print(f"Converted {count} values", file=sys.stderr)
+
+
+def run_serve(args):
+    service = ConversionService(UnitConverterCore(),
+                                batch_window=args.batch_window_ms / 1000,
+                                max_batch_size=args.max_batch)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Serving conversions on {where}", file=sys.stderr)
+    try:
+        asyncio.run(service.serve_forever(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Professional Unit Converter - batch mode")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    csv_parser = subparsers.add_parser("csv", help="Convert columns of a CSV file")
+    csv_parser.add_argument("input", help="Input CSV file, or - for stdin")
+    csv_parser.add_argument("-o", "--output", default="-", help="Output CSV file (default: stdout)")
+    csv_parser.add_argument("-c", "--column", action="append", required=True,
+                            metavar="NAME:FROM:TO", help="Column to convert; may be repeated")
+    csv_parser.add_argument("-t", "--type", default=None,
+                            help="Conversion type (default: resolved from the units)")
+    csv_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                            help=f"Rows converted per batch (default: {DEFAULT_CHUNK_SIZE})")
+    csv_parser.add_argument("--delimiter", default=",", help="Field delimiter (default: ,)")
+    csv_parser.set_defaults(func=run_csv)
+
+    binary_parser = subparsers.add_parser("binary", help="Convert a raw little-endian float array file")
+    binary_parser.add_argument("input", help="Input binary file")
+    binary_parser.add_argument("from_unit", help="Unit of the stored values")
+    binary_parser.add_argument("to_unit", help="Unit to convert to")
+    binary_parser.add_argument("-o", "--output", default=None,
+                               help="Output file (default: convert in place)")
+    binary_parser.add_argument("-t", "--type", default=None,
+                               help="Conversion type (default: resolved from the units)")
+    binary_parser.add_argument("--dtype", choices=sorted(BINARY_DTYPES), default="float64",
+                               help="Element type (default: float64)")
+    binary_parser.add_argument("--window-size", type=int, default=DEFAULT_WINDOW_SIZE,
+                               help=f"Elements per memory-mapped window (default: {DEFAULT_WINDOW_SIZE})")
+    binary_parser.add_argument("-j", "--workers", type=int, default=1,
+                               help="Worker processes; 0 uses all cores (default: 1)")
+    binary_parser.add_argument("--chunk-size", type=int, default=DEFAULT_PARALLEL_CHUNK_SIZE,
+                               help=f"Elements per worker task (default: {DEFAULT_PARALLEL_CHUNK_SIZE})")
+    binary_parser.set_defaults(func=run_binary)
+
+
+    serve_parser = subparsers.add_parser("serve", help="Run a JSON-lines conversion service")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="TCP host (default: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=8765, help="TCP port (default: 8765)")
+    serve_parser.add_argument("--unix", default=None, metavar="PATH",
+                              help="Listen on a Unix socket instead of TCP")
+    serve_parser.add_argument("--batch-window-ms", type=float, default=DEFAULT_BATCH_WINDOW * 1000,
+                              help="Max time a request waits to be batched "
+                                   f"(default: {DEFAULT_BATCH_WINDOW * 1000:g} ms)")
+    serve_parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                              help=f"Flush a batch at this many requests (default: {DEFAULT_MAX_BATCH_SIZE})")
+    serve_parser.set_defaults(func=run_serve)
+
+    return parser
+
+
+# -------------------- Main -------------------- #
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        args.func(args)
+    except (ValueError, OSError) as e:
+        parser.exit(1, f"Error: {e}\n")
+
+
+if __name__ == "__main__":
+    main()
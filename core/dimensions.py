@@ -0,0 +1,203 @@
+# core/dimensions.py
+
+"""
+Dimensional analysis for compound units such as m/s, km/h, kWh/day, N·m
+or W/m².
+
+Every compound unit is reduced to a CompoundUnit: a scale to SI base units
+plus an integer exponent vector over (length, mass, time, temperature,
+information). Two compound units convert into each other when their
+vectors match. Parsed strings are cached, so a repeated unit costs one
+dict lookup.
+"""
+
+import re
+
+# Exponent vector order
+BASE_DIMENSIONS = ("length", "mass", "time", "temperature", "information")
+BASE_SYMBOLS = ("m", "kg", "s", "K", "B")
+DIMENSIONLESS = (0, 0, 0, 0, 0)
+
+# Category -> (dimension vector, SI value of one category base unit)
+CATEGORY_DIMENSIONS = {
+    "Distance": ((1, 0, 0, 0, 0), 1.0),            # m
+    "Mass": ((0, 1, 0, 0, 0), 1e-3),               # g -> kg
+    "Time": ((0, 0, 1, 0, 0), 1.0),                # s
+    "Temperature": ((0, 0, 0, 1, 0), 5 / 9),       # °R -> K
+    "Computer Storage": ((0, 0, 0, 0, 1), 1.0),    # byte
+    "Volume": ((3, 0, 0, 0, 0), 1e-6),             # mL -> m³
+    "Power": ((2, 1, -3, 0, 0), 1.0),              # W
+    "Pressure": ((-1, 1, -2, 0, 0), 1.0),          # Pa
+    "Energy": ((2, 1, -2, 0, 0), 1.0),             # J
+}
+
+# Derived SI symbols that have no category of their own
+DERIVED_UNITS = {
+    "N": ((1, 1, -2, 0, 0), 1.0),
+    "newton": ((1, 1, -2, 0, 0), 1.0),
+    "newtons": ((1, 1, -2, 0, 0), 1.0),
+    "Hz": ((0, 0, -1, 0, 0), 1.0),
+    "hertz": ((0, 0, -1, 0, 0), 1.0),
+}
+
+MAX_CACHED_UNITS = 4096
+
+_SUPERSCRIPTS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹⁻⁺", "0123456789-+")
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?:\^|\*\*)(?P<exp>[-+]?\d+)
+      | (?P<op>[*·⋅/()])
+      | (?P<sup>[⁻⁺]?[⁰¹²³⁴⁵⁶⁷⁸⁹]+)
+      | (?P<name>[^\s*·⋅/()^⁰¹²³⁴⁵⁶⁷⁸⁹⁻⁺]+)
+    )""", re.VERBOSE)
+
+
+class CompoundUnit:
+    """A unit reduced to an SI scale and an integer dimension vector"""
+
+    __slots__ = ("name", "scale", "dimensions")
+
+    def __init__(self, name, scale, dimensions):
+        self.name = name
+        self.scale = scale
+        self.dimensions = dimensions
+
+    def __mul__(self, other):
+        return CompoundUnit(f"{self.name}·{other.name}", self.scale * other.scale,
+                            tuple(a + b for a, b in zip(self.dimensions, other.dimensions)))
+
+    def __truediv__(self, other):
+        return CompoundUnit(f"{self.name}/{other.name}", self.scale / other.scale,
+                            tuple(a - b for a, b in zip(self.dimensions, other.dimensions)))
+
+    def __pow__(self, exponent):
+        return CompoundUnit(f"{self.name}^{exponent}", self.scale ** exponent,
+                            tuple(a * exponent for a in self.dimensions))
+
+    def is_compatible(self, other):
+        return self.dimensions == other.dimensions
+
+    def __repr__(self):
+        return f"CompoundUnit({self.name!r}, scale={self.scale!r}, {format_dimensions(self.dimensions)})"
+
+
+def format_dimensions(dimensions):
+    """Render a dimension vector with SI base symbols, e.g. "m·s^-1" """
+    parts = []
+    for symbol, exponent in zip(BASE_SYMBOLS, dimensions):
+        if exponent == 1:
+            parts.append(symbol)
+        elif exponent:
+            parts.append(f"{symbol}^{exponent}")
+    return "·".join(parts) or "1"
+
+
+DIMENSIONLESS_UNIT = CompoundUnit("1", 1.0, DIMENSIONLESS)
+
+
+class DimensionRegistry:
+    """
+    Parses compound unit strings against a UnitRegistry's units.
+
+    Simple names and aliases are resolved through the registry's unit
+    index; results of parse() are memoized by the source string.
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self._cache = {}
+
+    def parse(self, text):
+        """Parse a compound unit string; raises ValueError if it is invalid"""
+        unit = self._cache.get(text)
+        if unit is None:
+            unit = self._parse(text)
+            if len(self._cache) >= MAX_CACHED_UNITS:
+                self._cache.clear()
+            self._cache[text] = unit
+        return unit
+
+    def simple_unit(self, name):
+        """Resolve one unit name or alias to a CompoundUnit"""
+        if name in DERIVED_UNITS:
+            dimensions, scale = DERIVED_UNITS[name]
+            return CompoundUnit(name, scale, dimensions)
+
+        entry = self.registry.lookup_unit(name)
+        if entry is None or entry[0] not in CATEGORY_DIMENSIONS:
+            raise ValueError(f"Unknown unit {name!r}")
+        conversion_type, canonical, factor = entry
+        unit_data = self.registry.unit_mappings[conversion_type]
+        if unit_data.get("offset", {}).get(canonical, 0):
+            raise ValueError(f"{name!r} has an offset and cannot be used in a compound unit")
+
+        dimensions, si_scale = CATEGORY_DIMENSIONS[conversion_type]
+        return CompoundUnit(name, unit_data["to_base"][canonical] * factor * si_scale, dimensions)
+
+    def _parse(self, text):
+        tokens = self._tokenize(text)
+        if not tokens:
+            raise ValueError("Empty unit")
+        unit, position = self._parse_product(tokens, 0, text)
+        if position != len(tokens):
+            raise ValueError(f"Unexpected {tokens[position][1]!r} in unit {text!r}")
+        unit.name = text
+        return unit
+
+    @staticmethod
+    def _tokenize(text):
+        tokens = []
+        position = 0
+        text = text.strip()
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if not match or match.end() == position:
+                raise ValueError(f"Invalid unit {text!r}")
+            position = match.end()
+            if match.group("op"):
+                tokens.append(("op", match.group("op")))
+            elif match.group("exp"):
+                tokens.append(("exp", int(match.group("exp"))))
+            elif match.group("sup"):
+                tokens.append(("exp", int(match.group("sup").translate(_SUPERSCRIPTS))))
+            elif match.group("name"):
+                tokens.append(("name", match.group("name")))
+        return tokens
+
+    def _parse_product(self, tokens, position, text):
+        unit, position = self._parse_factor(tokens, position, text)
+        while position < len(tokens):
+            kind, value = tokens[position]
+            if kind == "op" and value == "/":
+                other, position = self._parse_factor(tokens, position + 1, text)
+                unit = unit / other
+            elif kind == "op" and value in "*·⋅":
+                other, position = self._parse_factor(tokens, position + 1, text)
+                unit = unit * other
+            elif kind == "name" or (kind == "op" and value == "("):
+                # Juxtaposition ("N m") multiplies
+                other, position = self._parse_factor(tokens, position, text)
+                unit = unit * other
+            else:
+                break
+        return unit, position
+
+    def _parse_factor(self, tokens, position, text):
+        if position >= len(tokens):
+            raise ValueError(f"Unit {text!r} ends unexpectedly")
+        kind, value = tokens[position]
+        if kind == "op" and value == "(":
+            unit, position = self._parse_product(tokens, position + 1, text)
+            if position >= len(tokens) or tokens[position] != ("op", ")"):
+                raise ValueError(f"Unbalanced parentheses in unit {text!r}")
+            position += 1
+        elif kind == "name":
+            unit = DIMENSIONLESS_UNIT if value == "1" else self.simple_unit(value)
+            position += 1
+        else:
+            raise ValueError(f"Unexpected {value!r} in unit {text!r}")
+
+        if position < len(tokens) and tokens[position][0] == "exp":
+            unit = unit ** tokens[position][1]
+            position += 1
+        return unit, position
@@ -0,0 +1,287 @@
+# core/expressions.py
+
+"""
+Natural-language conversion expressions, e.g.
+
+    5 km + 300 m in miles
+    2.5 kWh / 3 hours to watts
+    (speed km/h) * 2 h in miles        # "speed" is a variable
+
+Expressions are compiled once into a small AST of quantities carrying an
+SI value and a dimension vector, and cached by source text. Evaluation only
+uses arithmetic operators, so variables may be bound to NumPy arrays to
+evaluate a compiled expression in vectorized form.
+
+Units follow a number, variable or parenthesized group and must be written
+without spaces ("m/s", "kWh/day"); + and - must be surrounded by spaces.
+"""
+
+import re
+
+from core.dimensions import CATEGORY_DIMENSIONS, DIMENSIONLESS, CompoundUnit, format_dimensions
+
+MAX_CACHED_EXPRESSIONS = 4096
+
+_TARGET = re.compile(r"^(?P<source>.*\S)\s+(?:in|to|as)\s+(?P<target>\S+)\s*$", re.DOTALL)
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+      | (?P<op>[-+*/()])
+      | (?P<word>[^\s+()]+)
+    )""", re.VERBOSE)
+
+
+class _Number:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def evaluate(self, variables):
+        return self.value, DIMENSIONLESS
+
+
+class _Variable:
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def evaluate(self, variables):
+        try:
+            return variables[self.name], DIMENSIONLESS
+        except KeyError:
+            raise ValueError(f"No value given for {self.name!r}") from None
+
+
+class _Quantity:
+    __slots__ = ("operand", "unit")
+
+    def __init__(self, operand, unit):
+        self.operand = operand
+        self.unit = unit
+
+    def evaluate(self, variables):
+        if self.unit.scale is None:
+            reason = "has an offset" if self.unit.dimensions is not None else "has no SI dimensions"
+            raise ValueError(f"{self.unit.name!r} {reason} and can only be converted on its own")
+        value, dimensions = self.operand.evaluate(variables)
+        return value * self.unit.scale, tuple(a + b for a, b in zip(dimensions, self.unit.dimensions))
+
+
+class _Negate:
+    __slots__ = ("operand",)
+
+    def __init__(self, operand):
+        self.operand = operand
+
+    def evaluate(self, variables):
+        value, dimensions = self.operand.evaluate(variables)
+        return -value, dimensions
+
+
+class _BinaryOp:
+    __slots__ = ("op", "left", "right")
+
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+    def evaluate(self, variables):
+        left, left_dims = self.left.evaluate(variables)
+        right, right_dims = self.right.evaluate(variables)
+        if self.op in "+-":
+            if left_dims != right_dims:
+                raise ValueError(f"Cannot add or subtract {format_dimensions(left_dims)} "
+                                 f"and {format_dimensions(right_dims)}")
+            return (left + right if self.op == "+" else left - right), left_dims
+        if self.op == "*":
+            return left * right, tuple(a + b for a, b in zip(left_dims, right_dims))
+        return left / right, tuple(a - b for a, b in zip(left_dims, right_dims))
+
+
+class CompiledExpression:
+    """
+    A parsed conversion expression.
+
+    evaluate(**variables) returns (value, unit name); value is in the target
+    unit when the expression has one ("... in miles"), otherwise in SI base
+    units named by their dimensions.
+    """
+
+    __slots__ = ("source", "root", "target", "target_name", "plan", "variables")
+
+    def __init__(self, source, root, target=None, target_name=None, plan=None, variables=()):
+        self.source = source
+        self.root = root
+        self.target = target
+        self.target_name = target_name
+        # Set for a single "value unit in unit" expression, which may be affine (°C in °F)
+        self.plan = plan
+        self.variables = variables
+
+    @property
+    def is_dimensionless(self):
+        return self.target is None and self.plan is None and self.dimensions() == DIMENSIONLESS
+
+    def dimensions(self):
+        """Dimension vector of the expression before conversion to the target"""
+        # Variables are dimensionless, so any placeholder value yields the dimensions
+        return self.root.evaluate(dict.fromkeys(self.variables, 1.0))[1]
+
+    def evaluate(self, **variables):
+        if self.plan is not None:
+            value, _ = self.root.operand.evaluate(variables)
+            return self.plan(value), self.target_name
+
+        value, dimensions = self.root.evaluate(variables)
+        if self.target is None:
+            return value, format_dimensions(dimensions)
+        if dimensions != self.target.dimensions:
+            raise ValueError(f"Cannot convert {format_dimensions(dimensions)} "
+                             f"to {self.target_name} ({format_dimensions(self.target.dimensions)})")
+        return value / self.target.scale, self.target_name
+
+
+class ExpressionCompiler:
+    """Compiles expression strings against a UnitRegistry, with a cache"""
+
+    def __init__(self, registry):
+        self.registry = registry
+        self._cache = {}
+
+    def compile(self, text):
+        """Compile (or fetch from cache) an expression; raises ValueError"""
+        expression = self._cache.get(text)
+        if expression is None:
+            expression = self._compile(text)
+            if len(self._cache) >= MAX_CACHED_EXPRESSIONS:
+                self._cache.clear()
+            self._cache[text] = expression
+        return expression
+
+    def _compile(self, text):
+        source, target_name = text.strip(), None
+        match = _TARGET.match(source)
+        if match:
+            source, target_name = match.group("source"), match.group("target")
+
+        parser = _Parser(self.registry, source)
+        root = parser.parse()
+        if target_name is None:
+            return CompiledExpression(text, root, variables=tuple(parser.variables))
+
+        # A lone quantity converted within its category keeps affine units working
+        if isinstance(root, _Quantity):
+            from_type = self.registry.find_conversion_type(root.unit.name)
+            if from_type is not None and from_type == self.registry.find_conversion_type(target_name):
+                plan = self.registry.compile(root.unit.name, target_name, from_type)
+                return CompiledExpression(text, root, target_name=target_name, plan=plan,
+                                          variables=tuple(parser.variables))
+
+        target = self.registry.parse_compound(target_name)
+        return CompiledExpression(text, root, target, target_name, variables=tuple(parser.variables))
+
+
+class _Parser:
+    """Recursive-descent parser producing the expression AST"""
+
+    def __init__(self, registry, text):
+        self.registry = registry
+        self.text = text
+        self.tokens = self._tokenize(text)
+        self.position = 0
+        self.variables = []
+
+    def _tokenize(self, text):
+        tokens = []
+        position = 0
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if not match or match.end() == position:
+                if text[position:].strip():
+                    raise ValueError(f"Cannot parse {text!r}")
+                break
+            position = match.end()
+            kind = match.lastgroup
+            tokens.append((kind, match.group(kind), match.start(kind) > 0 and text[match.start(kind) - 1].isspace()))
+        return tokens
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None, False)
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("Empty expression")
+        node = self._sum()
+        if self.position != len(self.tokens):
+            raise ValueError(f"Unexpected {self._peek()[1]!r} in {self.text!r}")
+        return node
+
+    def _sum(self):
+        node = self._term()
+        while self._peek()[0] == "op" and self._peek()[1] in "+-":
+            op = self.tokens[self.position][1]
+            self.position += 1
+            node = _BinaryOp(op, node, self._term())
+        return node
+
+    def _term(self):
+        node = self._unary()
+        while self._peek()[0] == "op" and self._peek()[1] in "*/":
+            op = self.tokens[self.position][1]
+            self.position += 1
+            node = _BinaryOp(op, node, self._unary())
+        return node
+
+    def _unary(self):
+        if self._peek()[:2] == ("op", "-"):
+            self.position += 1
+            operand = self._unary()
+            if isinstance(operand, _Quantity):
+                # "-40 °F" negates the number, not the absolute temperature
+                return _Quantity(_Negate(operand.operand), operand.unit)
+            return _Negate(operand)
+        if self._peek()[:2] == ("op", "+"):
+            self.position += 1
+        return self._primary()
+
+    def _primary(self):
+        kind, value, _ = self._peek()
+        if kind == "number":
+            self.position += 1
+            node = _Number(float(value))
+        elif kind == "word" and value.isidentifier():
+            self.position += 1
+            if value not in self.variables:
+                self.variables.append(value)
+            node = _Variable(value)
+        elif (kind, value) == ("op", "("):
+            self.position += 1
+            node = self._sum()
+            if self._peek()[:2] != ("op", ")"):
+                raise ValueError(f"Unbalanced parentheses in {self.text!r}")
+            self.position += 1
+        else:
+            raise ValueError(f"Expected a number in {self.text!r}")
+
+        kind, value, _ = self._peek()
+        if kind == "word":
+            self.position += 1
+            node = _Quantity(node, self._unit(value))
+        return node
+
+    def _unit(self, name):
+        conversion_type = self.registry.find_conversion_type(name)
+        if conversion_type is None:
+            return self.registry.parse_compound(name)
+        try:
+            unit = self.registry.parse_compound(name)
+        except ValueError:
+            # Affine units (°C) and units of pack categories without dimensions have
+            # no SI scale; they are only usable on their own, as in "x °C in °F"
+            dimensions = CATEGORY_DIMENSIONS.get(conversion_type)
+            return CompoundUnit(name, None, dimensions[0] if dimensions else None)
+        # Keep the original name so single-unit conversions can use the affine tables
+        return CompoundUnit(name, unit.scale, unit.dimensions)
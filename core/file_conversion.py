@@ -0,0 +1,180 @@
+# core/file_conversion.py
+
+import csv
+import os
+from itertools import islice
+
+import numpy as np
+
+from core.unit_conversion import UnitConverterCore
+
+DEFAULT_CHUNK_SIZE = 65536
+# Elements per memory-mapped window (8 MiB of float64)
+DEFAULT_WINDOW_SIZE = 1 << 20
+
+BINARY_DTYPES = {
+    "float64": np.dtype("<f8"),
+    "float32": np.dtype("<f4"),
+}
+
+
+def parse_column_spec(spec):
+    """
+    Parses a NAME:FROM:TO column specification.
+
+    Args:
+        spec (str): Column spec, e.g. "distance:km:miles".
+
+    Returns:
+        tuple: (column name, from unit, to unit).
+    """
+    parts = spec.rsplit(":", 2)
+    if len(parts) != 3 or not all(parts):
+        raise ValueError(f"Invalid column spec {spec!r}, expected NAME:FROM:TO")
+    return tuple(parts)
+
+
+def convert_csv_stream(infile, outfile, columns, converter=None, conversion_type=None,
+                       chunk_size=DEFAULT_CHUNK_SIZE, delimiter=","):
+    """
+    Streams a CSV from infile to outfile, converting the given columns.
+
+    Rows are read and written in chunks of chunk_size, each column being
+    converted with one vectorized convert_many call, so memory use does not
+    depend on the file size. Cells that are not numeric are written empty.
+
+    Args:
+        infile: Text file object opened with newline="".
+        outfile: Text file object opened with newline="".
+        columns (list): (column name, from unit, to unit) tuples.
+        converter (UnitConverterCore): Converter to use; a new one if None.
+        conversion_type (str): Category of all columns, or None to resolve
+            it from each column's from unit.
+        chunk_size (int): Number of rows converted per batch.
+        delimiter (str): CSV field delimiter.
+
+    Returns:
+        int: Number of data rows written.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    converter = converter or UnitConverterCore()
+    reader = csv.reader(infile, delimiter=delimiter)
+    writer = csv.writer(outfile, delimiter=delimiter)
+
+    header = next(reader, None)
+    if header is None:
+        return 0
+
+    targets = []
+    for name, from_unit, to_unit in columns:
+        if name not in header:
+            raise ValueError(f"Column {name!r} not found in CSV header")
+        # Validates the units once, before any row is read
+        converter.compile(from_unit, to_unit, conversion_type)
+        targets.append((header.index(name), from_unit, to_unit))
+    writer.writerow(header)
+
+    rows_written = 0
+    while True:
+        chunk = list(islice(reader, chunk_size))
+        if not chunk:
+            break
+        for index, from_unit, to_unit in targets:
+            raw = [row[index] if index < len(row) else "" for row in chunk]
+            converted = converter.convert_many(raw, from_unit, to_unit, conversion_type)
+            cells = converted["result"].tolist()
+            for row, cell, invalid in zip(chunk, cells, converted["invalid"].tolist()):
+                if index < len(row):
+                    row[index] = "" if invalid else repr(cell)
+        writer.writerows(chunk)
+        rows_written += len(chunk)
+    return rows_written
+
+
+def convert_binary_file(src_path, from_unit, to_unit, dst_path=None, conversion_type=None,
+                        dtype="float64", window_size=DEFAULT_WINDOW_SIZE, converter=None):
+    """
+    Converts a flat little-endian float array file through numpy.memmap.
+
+    The file is processed in fixed-size windows so that files larger than
+    RAM can be converted. Without dst_path the file is converted in place.
+
+    Args:
+        src_path (str): Raw binary input file.
+        from_unit (str): Unit of the stored values.
+        to_unit (str): Unit to convert to.
+        dst_path (str): Output file, or None to convert in place.
+        conversion_type (str): Category, or None to resolve it from from_unit.
+        dtype (str): "float64" or "float32".
+        window_size (int): Number of elements converted per window.
+        converter (UnitConverterCore): Converter to use; a new one if None.
+
+    Returns:
+        int: Number of values converted.
+    """
+    converter = converter or UnitConverterCore()
+    plan = converter.compile(from_unit, to_unit, conversion_type)
+    count, dst_path = prepare_binary_output(src_path, dst_path, dtype, window_size)
+    if count:
+        convert_binary_range(src_path, dst_path, dtype, 0, count, plan.scale, plan.offset, window_size)
+    return count
+
+
+def prepare_binary_output(src_path, dst_path, dtype, window_size):
+    """
+    Validates a binary conversion and sizes the output file.
+
+    Returns:
+        tuple: (number of elements, output path) where the output path is
+        src_path for an in-place conversion.
+    """
+    if dtype not in BINARY_DTYPES:
+        raise ValueError(f"Unsupported dtype {dtype!r}, expected one of {', '.join(BINARY_DTYPES)}")
+    if window_size < 1:
+        raise ValueError("window_size must be at least 1")
+    itemsize = BINARY_DTYPES[dtype].itemsize
+
+    size = os.path.getsize(src_path)
+    if size % itemsize:
+        raise ValueError(f"{src_path} size is not a multiple of {itemsize} bytes")
+
+    if dst_path is None or os.path.abspath(dst_path) == os.path.abspath(src_path):
+        return size // itemsize, src_path
+    with open(dst_path, "wb") as f:
+        f.truncate(size)
+    return size // itemsize, dst_path
+
+
+def convert_binary_range(src_path, dst_path, dtype, start, stop, scale, offset,
+                         window_size=DEFAULT_WINDOW_SIZE):
+    """
+    Converts elements [start, stop) of a binary file into dst_path.
+
+    dst_path must already have the size of src_path (see
+    prepare_binary_output); it may be src_path itself for in-place mode.
+    Only the requested range is mapped, so disjoint ranges can be converted
+    concurrently by separate processes.
+    """
+    dtype = BINARY_DTYPES[dtype]
+    in_place = os.path.abspath(dst_path) == os.path.abspath(src_path)
+    byte_offset = start * dtype.itemsize
+    shape = (stop - start,)
+
+    source = np.memmap(src_path, dtype=dtype, mode="r+" if in_place else "r",
+                       offset=byte_offset, shape=shape)
+    target = source if in_place else np.memmap(dst_path, dtype=dtype, mode="r+",
+                                               offset=byte_offset, shape=shape)
+    scale = dtype.type(scale)
+    offset = dtype.type(offset)
+
+    try:
+        for first in range(0, shape[0], window_size):
+            window = slice(first, min(first + window_size, shape[0]))
+            out = target[window]
+            np.multiply(source[window], scale, out=out)
+            if offset:
+                np.add(out, offset, out=out)
+        target.flush()
+    finally:
+        del source, target
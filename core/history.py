@@ -0,0 +1,60 @@
+# core/history.py
+
+"""
+Fixed-capacity conversion history.
+
+Entries are kept newest-first in a collections.deque with maxlen, so adding
+a conversion is O(1) regardless of how much history is kept: the oldest
+entry falls off the end once the store is full. Iteration walks the deque
+directly without copying.
+"""
+
+from collections import deque
+
+DEFAULT_HISTORY_CAPACITY = 5000
+
+
+class HistoryStore:
+    """Newest-first ring buffer of conversion history entries"""
+
+    def __init__(self, entries=(), capacity=DEFAULT_HISTORY_CAPACITY):
+        if capacity < 1:
+            raise ValueError("History capacity must be at least 1")
+        self._entries = deque(maxlen=capacity)
+        self.load(entries)
+
+    @property
+    def capacity(self):
+        return self._entries.maxlen
+
+    def add(self, entry):
+        """Add the newest entry, dropping the oldest one when full"""
+        self._entries.appendleft(entry)
+
+    def load(self, entries):
+        """Replace the contents with newest-first entries, keeping the newest `capacity`"""
+        self._entries.clear()
+        for entry in entries:
+            if len(self._entries) == self.capacity:
+                break
+            self._entries.append(entry)
+
+    def clear(self):
+        self._entries.clear()
+
+    def to_list(self):
+        """Copy the entries newest-first, e.g. for persisting or exporting"""
+        return list(self._entries)
+
+    def __getitem__(self, index):
+        # deque indexing is O(1) near both ends, where the recent entries live
+        return self._entries[index]
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"HistoryStore({len(self)}/{self.capacity} entries)"
@@ -0,0 +1,266 @@
+# core/history_db.py
+
+"""
+Append-only SQLite persistence for the conversion history.
+
+Entries are written incrementally by a background writer thread, so the
+GUI thread only enqueues a dict per conversion and a crash loses at most
+the entries still in the queue. The database runs in WAL mode, which lets
+readers page through history while the writer appends. Startup only needs
+the most recent page (recent()); older pages are fetched on demand with
+recent(before_id=...).
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 200
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    type TEXT NOT NULL,
+    formatted TEXT NOT NULL,
+    value TEXT,
+    from_unit TEXT,
+    to_unit TEXT,
+    result REAL
+);
+CREATE INDEX IF NOT EXISTS history_created_at ON history (created_at);
+CREATE INDEX IF NOT EXISTS history_type ON history (type);
+CREATE INDEX IF NOT EXISTS history_type_nocase ON history (type COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS history_value_nocase ON history (value COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS history_from_unit_nocase ON history (from_unit COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS history_to_unit_nocase ON history (to_unit COLLATE NOCASE);
+"""
+
+# Columns matched by search(); each has a NOCASE index so a prefix LIKE is an index range scan
+SEARCH_COLUMNS = ("type", "value", "from_unit", "to_unit")
+SEARCH_PROBE_ROWS = 20000
+
+_COLUMNS = ("id", "created_at", "type", "formatted", "value", "from_unit", "to_unit", "result")
+_INSERT = ("INSERT INTO history (created_at, type, formatted, value, from_unit, to_unit, result) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+# Writer queue commands besides plain entries
+_CLEAR = object()
+_STOP = object()
+
+
+def default_history_path():
+    """Get the history database path (HISTORY_DB_PATH, else the user data dir)"""
+    configured = os.getenv("HISTORY_DB_PATH")
+    if configured:
+        return configured
+    base = os.getenv("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "professional_unit_converter", "history.sqlite3")
+
+
+def connect(path):
+    """Open a connection to the history database, creating the schema if needed"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+def entry_row(entry):
+    """Map a history entry dict to INSERT parameters"""
+    created_at = entry.get("created_at")
+    if not created_at:
+        # Older entries only carry the time of day; date them today
+        now = datetime.now()
+        created_at = f"{now.date().isoformat()}T{entry.get('timestamp') or now.strftime('%H:%M:%S')}"
+    result = entry.get("result")
+    return (created_at, entry.get("type", "Unknown"), entry.get("formatted", ""),
+            None if entry.get("value") is None else str(entry["value"]),
+            entry.get("from_unit"), entry.get("to_unit"),
+            None if result is None else float(result))
+
+
+def row_entry(row):
+    """Map a history row to the entry dict used by the UI"""
+    entry = dict(zip(_COLUMNS, row))
+    # The UI shows the time of day; created_at keeps the full date
+    entry["timestamp"] = entry["created_at"][11:19]
+    return entry
+
+
+class HistoryDatabase:
+    """Append-only conversion history backed by SQLite in WAL mode"""
+
+    def __init__(self, path=None):
+        self.path = path or default_history_path()
+        self._read = connect(self.path)
+        self._read_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    # -------------------- Writes (background thread) -------------------- #
+
+    def append(self, entry):
+        """Queue an entry for writing; returns immediately"""
+        self._queue.put(entry_row(entry))
+
+    def import_entries(self, entries):
+        """Queue newest-first entries (e.g. from an older store), keeping their order"""
+        for entry in reversed(list(entries)):
+            self.append(entry)
+
+    def clear(self):
+        """Queue deletion of all history"""
+        self._queue.put(_CLEAR)
+
+    def flush(self):
+        """Block until every queued write is committed"""
+        self._queue.join()
+
+    def close(self):
+        """Flush pending writes and stop the writer thread"""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        with self._read_lock:
+            self._read.close()
+
+    def _write_loop(self):
+        connection = connect(self.path)
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            # Drain whatever else is queued so a burst commits in one transaction
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                rows = []
+                for item in batch:
+                    if item is _STOP:
+                        running = False
+                    elif item is _CLEAR:
+                        if rows:
+                            connection.executemany(_INSERT, rows)
+                            rows = []
+                        connection.execute("DELETE FROM history")
+                    else:
+                        rows.append(item)
+                if rows:
+                    connection.executemany(_INSERT, rows)
+                connection.commit()
+            except sqlite3.Error:
+                # History is best effort; never take the application down
+                connection.rollback()
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        connection.close()
+
+    # -------------------- Reads -------------------- #
+
+    def recent(self, limit=DEFAULT_PAGE_SIZE, before_id=None, conversion_type=None):
+        """
+        Fetch one page of entries, newest first.
+
+        Pass the smallest "id" of the previous page as before_id to fetch the
+        next older page.
+        """
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM history"
+        clauses, params = [], []
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        if conversion_type is not None:
+            clauses.append("type = ?")
+            params.append(conversion_type)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        with self._read_lock:
+            rows = self._read.execute(sql, params).fetchall()
+        return [row_entry(row) for row in rows]
+
+    def search(self, text, limit=DEFAULT_PAGE_SIZE, before_id=None):
+        """
+        Fetch entries whose type, input value or units start with text
+        (case-insensitive), newest first; paged like recent().
+
+        The newest SEARCH_PROBE_ROWS rows are filtered in id order first,
+        which fills the page quickly for common terms. Whatever is still
+        missing comes from the NOCASE indexes (prefix LIKE range scans), so
+        rare terms never scan the whole table either.
+        """
+        text = text.strip()
+        if not text:
+            return self.recent(limit, before_id)
+
+        limit = int(limit)
+        pattern = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        columns = ", ".join(_COLUMNS)
+        params = [pattern] * len(SEARCH_COLUMNS)
+        upper = before_id if before_id is not None else (1 << 63) - 1
+
+        with self._read_lock:
+            row = self._read.execute(
+                f"SELECT id FROM history WHERE id < ? ORDER BY id DESC LIMIT 1 OFFSET {SEARCH_PROBE_ROWS - 1}",
+                (upper,)).fetchone()
+            lower = row[0] if row else 0
+
+            # Probe: "+column" keeps SQLite on the id range instead of the LIKE indexes
+            probe = " OR ".join(f"+{column} LIKE ? ESCAPE '\\'" for column in SEARCH_COLUMNS)
+            rows = self._read.execute(
+                f"SELECT {columns} FROM history WHERE ({probe}) AND id < ? AND id >= ? "
+                f"ORDER BY id DESC LIMIT {limit}", params + [upper, lower]).fetchall()
+
+            if len(rows) < limit and lower > 0:
+                # Fallback: "+id" keeps SQLite on the LIKE indexes instead of a table scan
+                matches = " OR ".join(f"{column} LIKE ? ESCAPE '\\'" for column in SEARCH_COLUMNS)
+                rows += self._read.execute(
+                    f"SELECT {columns} FROM history WHERE ({matches}) AND +id < ? "
+                    f"ORDER BY id DESC LIMIT {limit - len(rows)}", params + [lower]).fetchall()
+        return [row_entry(row) for row in rows]
+
+    def between(self, since, until=None, limit=DEFAULT_PAGE_SIZE):
+        """Fetch entries created in [since, until) (ISO 8601 strings), newest first"""
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM history WHERE created_at >= ?"
+        params = [since]
+        if until is not None:
+            sql += " AND created_at < ?"
+            params.append(until)
+        sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+        with self._read_lock:
+            rows = self._read.execute(sql, params).fetchall()
+        return [row_entry(row) for row in rows]
+
+    def iter_entries(self, batch_size=1000):
+        """
+        Iterate over the whole history newest first, batch_size rows at a time.
+
+        Uses its own connection (a consistent WAL snapshot), so it can run in
+        a worker thread while the GUI keeps reading and the writer appends.
+        """
+        connection = connect(self.path)
+        try:
+            cursor = connection.execute(f"SELECT {', '.join(_COLUMNS)} FROM history ORDER BY id DESC")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row_entry(row)
+        finally:
+            connection.close()
+
+    def count(self):
+        with self._read_lock:
+            return self._read.execute("SELECT COUNT(*) FROM history").fetchone()[0]
@@ -0,0 +1,100 @@
+# core/history_export.py
+
+"""
+Streaming conversion history export.
+
+Entries are written one row at a time as JSON Lines (one JSON object per
+line) or CSV, so memory stays flat however long the history is. The
+export is written to a temporary file next to the target and moved into
+place when complete; a cancelled or failed export leaves no partial file.
+"""
+
+import csv
+import json
+import os
+import tempfile
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_FIELDS = ("created_at", "type", "value", "from_unit", "to_unit", "result", "formatted")
+PROGRESS_INTERVAL = 1000
+
+
+def _read_umask():
+    # os.umask can only be read by setting it, so do it once at import time
+    # rather than from the export thread while others may be creating files
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _read_umask()
+
+
+class ExportCancelled(Exception):
+    """Raised by export_history when the cancelled callback returns True"""
+
+
+def export_record(entry):
+    """Select the exported fields of an entry, in EXPORT_FIELDS order"""
+    record = {field: entry.get(field) for field in EXPORT_FIELDS}
+    if record["created_at"] is None:
+        # Entries from before the SQLite history only carry the time of day
+        record["created_at"] = entry.get("timestamp")
+    return record
+
+
+def export_format_for_path(path):
+    """Guess the export format from a file extension (defaults to NDJSON)"""
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def export_history(entries, path, export_format="ndjson", total=None, progress=None, cancelled=None):
+    """
+    Write history entries to path, row by row.
+
+    Args:
+        entries (iterable): History entry dicts, e.g. HistoryDatabase.iter_entries().
+        path (str): Output file.
+        export_format (str): "ndjson" or "csv".
+        total (int): Number of entries, passed through to progress.
+        progress (callable): Called as progress(written, total) every
+            PROGRESS_INTERVAL rows and once at the end.
+        cancelled (callable): Polled with the same interval; returning True
+            aborts the export with ExportCancelled.
+
+    Returns:
+        int: Number of entries written.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format {export_format!r}")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    written = 0
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            if export_format == "csv":
+                writer = csv.writer(f)
+                writer.writerow(EXPORT_FIELDS)
+                write = lambda entry: writer.writerow(export_record(entry).values())
+            else:
+                write = lambda entry: f.write(json.dumps(export_record(entry), ensure_ascii=False, default=str) + "\n")
+
+            for entry in entries:
+                write(entry)
+                written += 1
+                if written % PROGRESS_INTERVAL == 0:
+                    if cancelled is not None and cancelled():
+                        raise ExportCancelled(f"Export cancelled after {written} entries")
+                    if progress is not None:
+                        progress(written, total)
+        # mkstemp creates the file 0600; give the export the mode a plain open() would
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    if progress is not None:
+        progress(written, total)
+    return written
@@ -0,0 +1,145 @@
+# core/instrumentation.py
+
+"""
+In-memory metrics for UnitConverterCore instrumentation hooks.
+
+    collector = MetricsCollector()
+    converter.add_hook(collector)
+    ...
+    collector.snapshot()
+"""
+
+import threading
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of non-negative integer values.
+
+    Values are bucketed by their top sub_bucket_bits significant bits, so
+    recording is O(1) and every bucket has a relative width below
+    2 ** (1 - sub_bucket_bits) (under 1.6% with the default of 7 bits).
+    """
+
+    __slots__ = ("sub_bucket_bits", "counts", "total", "sum", "min", "max")
+
+    def __init__(self, sub_bucket_bits=7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts = {}
+        self.total = 0
+        self.sum = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        shift = value.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return value
+        return (shift << (self.sub_bucket_bits - 1)) + (value >> shift)
+
+    def _lower_bound(self, index):
+        half = 1 << (self.sub_bucket_bits - 1)
+        if index < 2 * half:
+            return index
+        shift = (index >> (self.sub_bucket_bits - 1)) - 1
+        return (index - shift * half) << shift
+
+    def record(self, value, count=1):
+        value = max(0, int(value))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total += count
+        self.sum += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, fraction):
+        """Lower bound of the bucket holding the given fraction (0..1) of values"""
+        if not self.total:
+            return 0
+        rank = max(1, int(round(fraction * self.total)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self._lower_bound(index), self.min), self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            "count": self.total,
+            "min": self.min or 0,
+            "max": self.max or 0,
+            "mean": self.sum / self.total if self.total else 0.0,
+            "p50": self.percentile(0.50),
+            "p90": self.percentile(0.90),
+            "p99": self.percentile(0.99),
+            "p999": self.percentile(0.999),
+        }
+
+
+class _Stats:
+    __slots__ = ("calls", "values", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.values = 0
+        self.latency = LatencyHistogram()
+
+    def record(self, elapsed_ns, count):
+        self.calls += 1
+        self.values += count
+        self.latency.record(elapsed_ns)
+
+    def snapshot(self):
+        return {"calls": self.calls, "values": self.values, "latency_ns": self.latency.snapshot()}
+
+
+class MetricsCollector:
+    """
+    Hook collecting call counts and latency histograms.
+
+    Metrics are kept per operation, per conversion type and per
+    "type:from->to" unit pair. Safe to share between threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations = {}
+        self._categories = {}
+        self._pairs = {}
+
+    def __call__(self, operation, conversion_type, from_unit, to_unit, elapsed_ns, count):
+        pair = f"{conversion_type}:{from_unit}->{to_unit}"
+        with self._lock:
+            for table, key in ((self._operations, operation),
+                               (self._categories, conversion_type),
+                               (self._pairs, pair)):
+                stats = table.get(key)
+                if stats is None:
+                    stats = table[key] = _Stats()
+                stats.record(elapsed_ns, count)
+
+    def snapshot(self, reset=False):
+        """Get the collected metrics as plain dicts, optionally resetting them"""
+        with self._lock:
+            snapshot = {
+                "operations": {k: v.snapshot() for k, v in self._operations.items()},
+                "categories": {str(k): v.snapshot() for k, v in self._categories.items()},
+                "pairs": {k: v.snapshot() for k, v in self._pairs.items()},
+            }
+            if reset:
+                self._clear()
+        return snapshot
+
+    def reset(self):
+        """Drop all collected metrics"""
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self._operations = {}
+        self._categories = {}
+        self._pairs = {}
@@ -0,0 +1,150 @@
+# core/parallel.py
+
+"""
+Process-pool execution of large batch conversions.
+
+Array chunks are exchanged through multiprocessing.shared_memory and binary
+files through per-process memory maps, so no values are pickled between
+processes. Every worker keeps its own UnitConverterCore and compiled plans.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core.file_conversion import DEFAULT_WINDOW_SIZE, convert_binary_range, prepare_binary_output
+from core.unit_conversion import UnitConverterCore
+
+# Elements handed to a worker per task
+DEFAULT_PARALLEL_CHUNK_SIZE = 1 << 20
+
+_worker_converter = None
+
+
+def _init_worker():
+    global _worker_converter
+    _worker_converter = UnitConverterCore()
+
+
+def _convert_shared_chunk(shm_name, count, start, stop, from_unit, to_unit, conversion_type):
+    plan = _worker_converter.compile(from_unit, to_unit, conversion_type)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        data = np.ndarray((count,), dtype=np.float64, buffer=shm.buf)
+        chunk = data[start:stop]
+        np.multiply(chunk, plan.scale, out=chunk)
+        if plan.offset:
+            np.add(chunk, plan.offset, out=chunk)
+        del data, chunk
+    finally:
+        shm.close()
+    return stop - start
+
+
+def _convert_file_chunk(src_path, dst_path, dtype, start, stop, from_unit, to_unit,
+                        conversion_type, window_size):
+    plan = _worker_converter.compile(from_unit, to_unit, conversion_type)
+    convert_binary_range(src_path, dst_path, dtype, start, stop, plan.scale, plan.offset, window_size)
+    return stop - start
+
+
+def _chunk_bounds(count, chunk_size):
+    return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+
+def _resolve_workers(workers):
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    return workers
+
+
+def convert_parallel(values, from_unit, to_unit, conversion_type=None, workers=None,
+                     chunk_size=DEFAULT_PARALLEL_CHUNK_SIZE, converter=None):
+    """
+    Converts a large batch across a pool of worker processes.
+
+    Values are copied once into a shared memory block that workers convert
+    in place, chunk by chunk, so the result keeps the input order.
+
+    Args:
+        values: NumPy array, array.array or sequence of numbers.
+        from_unit (str): Unit of the values.
+        to_unit (str): Unit to convert to.
+        conversion_type (str): Category, or None to resolve it from from_unit.
+        workers (int): Number of processes; all cores if None.
+        chunk_size (int): Elements per worker task.
+        converter (UnitConverterCore): Converter used for validation and for
+            inputs too small to be worth splitting.
+
+    Returns:
+        dict: {"result": ndarray, "invalid": bool mask}, or {"error": ...}
+        like UnitConverterCore.convert_many.
+    """
+    converter = converter or UnitConverterCore()
+    workers = _resolve_workers(workers)
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    try:
+        converter.compile(from_unit, to_unit, conversion_type)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    values = converter._as_float_array(values)
+    if workers == 1 or values.size <= chunk_size:
+        return converter.convert_many(values, from_unit, to_unit, conversion_type)
+
+    shape = values.shape
+    count = values.size
+    shm = shared_memory.SharedMemory(create=True, size=values.nbytes)
+    try:
+        data = np.ndarray((count,), dtype=np.float64, buffer=shm.buf)
+        data[:] = values.ravel()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(_convert_shared_chunk, shm.name, count, start, stop,
+                                   from_unit, to_unit, conversion_type)
+                       for start, stop in _chunk_bounds(count, chunk_size)]
+            for future in futures:
+                future.result()
+        result = data.reshape(shape).copy()
+        del data
+    finally:
+        shm.close()
+        shm.unlink()
+
+    invalid = ~np.isfinite(values)
+    result[invalid] = np.nan
+    return {"result": result, "invalid": invalid}
+
+
+def convert_binary_file_parallel(src_path, from_unit, to_unit, dst_path=None, conversion_type=None,
+                                 dtype="float64", workers=None, window_size=DEFAULT_WINDOW_SIZE,
+                                 chunk_size=DEFAULT_PARALLEL_CHUNK_SIZE, converter=None):
+    """
+    Converts a raw binary array file across a pool of worker processes.
+
+    Same arguments as core.file_conversion.convert_binary_file, plus the
+    number of worker processes and the elements per worker task. Each
+    worker memory-maps only its own range of the file.
+
+    Returns:
+        int: Number of values converted.
+    """
+    converter = converter or UnitConverterCore()
+    workers = _resolve_workers(workers)
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    converter.compile(from_unit, to_unit, conversion_type)
+    count, dst_path = prepare_binary_output(src_path, dst_path, dtype, window_size)
+    if not count:
+        return 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(_convert_file_chunk, src_path, dst_path, dtype, start, stop,
+                               from_unit, to_unit, conversion_type, window_size)
+                   for start, stop in _chunk_bounds(count, chunk_size)]
+        for future in futures:
+            future.result()
+    return count
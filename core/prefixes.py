@@ -0,0 +1,60 @@
+# core/prefixes.py
+
+"""
+SI and IEC prefix rules used to synthesize prefixed units on demand.
+
+A category lists which of its unit names accept which rule, e.g.
+{"m": "si", "meter": "si_names", "B": "iec"}; "nm", "nanometer" or "KiB"
+are then resolved from the base unit the first time they are looked up.
+"""
+
+_SI_SYMBOLS = {
+    "y": 1e-24, "z": 1e-21, "a": 1e-18, "f": 1e-15, "p": 1e-12, "n": 1e-9,
+    "µ": 1e-6, "μ": 1e-6, "u": 1e-6, "m": 1e-3, "c": 1e-2, "d": 1e-1,
+    "da": 1e1, "h": 1e2, "k": 1e3, "M": 1e6, "G": 1e9, "T": 1e12,
+    "P": 1e15, "E": 1e18, "Z": 1e21, "Y": 1e24,
+}
+
+_SI_NAMES = {
+    "yocto": 1e-24, "zepto": 1e-21, "atto": 1e-18, "femto": 1e-15, "pico": 1e-12,
+    "nano": 1e-9, "micro": 1e-6, "milli": 1e-3, "centi": 1e-2, "deci": 1e-1,
+    "deca": 1e1, "deka": 1e1, "hecto": 1e2, "kilo": 1e3, "mega": 1e6, "giga": 1e9,
+    "tera": 1e12, "peta": 1e15, "exa": 1e18, "zetta": 1e21, "yotta": 1e24,
+}
+
+_IEC_SYMBOLS = {
+    "Ki": 1024, "Mi": 1024**2, "Gi": 1024**3, "Ti": 1024**4,
+    "Pi": 1024**5, "Ei": 1024**6, "Zi": 1024**7, "Yi": 1024**8,
+}
+
+_IEC_NAMES = {
+    "kibi": 1024, "mebi": 1024**2, "gibi": 1024**3, "tebi": 1024**4,
+    "pebi": 1024**5, "exbi": 1024**6, "zebi": 1024**7, "yobi": 1024**8,
+}
+
+# Rule name -> (prefix, factor) pairs, longest prefix first
+PREFIX_RULES = {
+    rule: sorted(table.items(), key=lambda item: -len(item[0]))
+    for rule, table in (("si", _SI_SYMBOLS), ("si_names", _SI_NAMES),
+                        ("iec", _IEC_SYMBOLS), ("iec_names", _IEC_NAMES))
+}
+
+
+def split_prefix(name, prefix_bases):
+    """
+    Split a prefixed unit name into its base unit and prefix factor.
+
+    Args:
+        name (str): Unit name, e.g. "nm" or "kibibytes".
+        prefix_bases (dict): Base unit name -> prefix rule name.
+
+    Returns:
+        tuple: (base unit name, factor), or None if no rule matches.
+    """
+    for prefix_rule in {*prefix_bases.values()}:
+        for prefix, factor in PREFIX_RULES[prefix_rule]:
+            if name.startswith(prefix):
+                base = name[len(prefix):]
+                if base and prefix_bases.get(base) == prefix_rule:
+                    return base, factor
+    return None
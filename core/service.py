@@ -0,0 +1,127 @@
+# core/service.py
+
+"""
+Local conversion service speaking JSON lines over TCP or a Unix socket.
+
+Each request is one JSON object per line:
+    {"id": 1, "value": 5, "from": "km", "to": "miles", "type": "Distance"}
+("type" is optional) and is answered with one line:
+    {"id": 1, "result": 3.1068559611866697}   or   {"id": 1, "error": "..."}
+Values or results that are not finite (NaN, infinity, overflow) are
+answered with an error, so every response is strict JSON.
+
+Concurrent requests for the same unit pair that arrive within the batching
+window are converted together in one vectorized operation.
+"""
+
+import asyncio
+import json
+import math
+
+import numpy as np
+
+from core.unit_conversion import UnitConverterCore
+
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BATCH_SIZE = 1024
+
+
+class ConversionService:
+    """Asyncio conversion server with per-unit-pair micro-batching"""
+
+    def __init__(self, converter=None, batch_window=DEFAULT_BATCH_WINDOW,
+                 max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+        if batch_window < 0:
+            raise ValueError("batch_window must not be negative")
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.converter = converter or UnitConverterCore()
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        # plan -> ([values], [futures], flush timer handle)
+        self._pending = {}
+
+    async def convert(self, value, from_unit, to_unit, conversion_type=None):
+        """
+        Queue one conversion and wait for its batch to be flushed.
+
+        A request waits at most batch_window seconds before its batch runs.
+        Raises ValueError for invalid values or units, or a result that is
+        not finite.
+        """
+        value = float(value)
+        if not math.isfinite(value):
+            raise ValueError("Invalid input value")
+        plan = self.converter.compile(from_unit, to_unit, conversion_type)
+        future = asyncio.get_running_loop().create_future()
+
+        batch = self._pending.get(plan)
+        if batch is None:
+            handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush, plan)
+            batch = self._pending[plan] = ([], [], handle)
+        batch[0].append(value)
+        batch[1].append(future)
+        if len(batch[0]) >= self.max_batch_size:
+            self._flush(plan)
+        return await future
+
+    def _flush(self, plan):
+        batch = self._pending.pop(plan, None)
+        if batch is None:
+            return
+        values, futures, handle = batch
+        handle.cancel()
+        results = plan(np.array(values, dtype=np.float64)).tolist()
+        for future, result in zip(futures, results):
+            if future.done():
+                continue
+            if math.isfinite(result):
+                future.set_result(result)
+            else:
+                future.set_exception(ValueError("Result is out of range"))
+
+    async def _answer(self, line, writer, write_lock):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            result = await self.convert(request["value"], request["from"], request["to"],
+                                        request.get("type"))
+            response = {"id": request_id, "result": result}
+        except KeyError as e:
+            response = {"id": request_id, "error": f"Missing field {e}"}
+        except (ValueError, TypeError, AttributeError) as e:
+            response = {"id": request_id, "error": str(e) or "Invalid request"}
+
+        async with write_lock:
+            writer.write((json.dumps(response) + "\n").encode())
+            await writer.drain()
+
+    async def handle_client(self, reader, writer):
+        """Serve one connection; requests on it are answered concurrently"""
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._answer(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        """Start listening on a TCP port, or on a Unix socket if unix_path is set"""
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle_client, path=unix_path)
+        return await asyncio.start_server(self.handle_client, host=host, port=port)
+
+    async def serve_forever(self, host="127.0.0.1", port=8765, unix_path=None):
+        server = await self.start(host, port, unix_path)
+        async with server:
+            await server.serve_forever()
@@ -1,128 +1,422 @@
 #core/unit_conversion.py
 
+import os
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+
+import numpy as np
+
+from core.dimensions import format_dimensions
+from core.unit_registry import ConversionPlan, get_registry
+
+# Batches smaller than this run on the calling thread
+DEFAULT_THREAD_CHUNK_SIZE = 1 << 15
+
+_thread_pool = None
+_thread_pool_lock = threading.Lock()
+
+
+def _get_thread_pool():
+    """Get the process-wide conversion thread pool, created on first use"""
+    global _thread_pool
+    if _thread_pool is None:
+        with _thread_pool_lock:
+            if _thread_pool is None:
+                _thread_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                                  thread_name_prefix="unit-convert")
+    return _thread_pool
+
+
+def _convert_slice(values, result, invalid, start, stop, scale, offset):
+    """Convert values[start:stop] into preallocated outputs
+
+    Every step writes into its own slice with out=, so threads share no
+    mutable state and NumPy releases the GIL for the whole kernel.
+    """
+    source = values[start:stop]
+    target = result[start:stop]
+    mask = invalid[start:stop]
+    np.multiply(source, scale, out=target)
+    np.add(target, offset, out=target)
+    np.isfinite(source, out=mask)
+    np.logical_not(mask, out=mask)
+    np.copyto(target, np.nan, where=mask)
+
+
+class ConversionResult(Mapping):
+    """Result of a single conversion
+
+    Behaves like the {"result": ..., "formatted": ...} dict returned before,
+    but "formatted" is only rendered on first access and then cached.
+    """
+
+    __slots__ = ("value", "from_unit", "to_unit", "result", "_formatted")
+
+    _keys = ("result", "formatted")
+
+    def __init__(self, value, from_unit, to_unit, result):
+        self.value = value
+        self.from_unit = from_unit
+        self.to_unit = to_unit
+        self.result = result
+        self._formatted = None
+
+    @property
+    def formatted(self):
+        if self._formatted is None:
+            self._formatted = f"{self.value} {self.from_unit} = {self.result:,.4f} {self.to_unit}"
+        return self._formatted
+
+    def __getitem__(self, key):
+        if key == "result":
+            return self.result
+        if key == "formatted":
+            return self.formatted
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return f"ConversionResult({dict(self)!r})"
+
+
 class UnitConverterCore:
     """Core unit conversion logic"""
-    
-    def __init__(self):
-        self.unit_mappings = {
-            "Distance": {
-                "units": ["mm", "cm", "m", "km", "miles", "yards", "feet", "inch"],
-                "to_base": {
-                    "mm": 0.001, "cm": 0.01, "m": 1, "km": 1000,
-                    "miles": 1609.344, "yards": 0.9144, "feet": 0.3048, "inch": 0.0254
-                }
-            },
-            "Time": {
-                "units": ["seconds", "minutes", "hours", "days", "years", "decades", "centuries"],
-                "to_base": {
-                    "seconds": 1, "minutes": 60, "hours": 3600,
-                    "days": 86400, "years": 31536000,
-                    "decades": 315360000, "centuries": 3153600000
-                }
-            },
-            "Temperature": {
-                "units": ["Celsius", "Fahrenheit", "Kelvin"],
-                "to_base": {}  # Special handling
-            },
-            "Mass": {
-                "units": ["grams", "kilograms", "milligrams", "pounds", "ounces", "ton"],
-                "to_base": {
-                    "grams": 1, "kilograms": 1000, "milligrams": 0.001,
-                    "pounds": 453.592, "ounces": 28.3495, "ton": 1_000_000
-                }
-            },
-            "Volume": {
-                "units": ["milliliters", "centiliters", "deciliters", "liters", "gallons", "cups", "quarts", "pints"],
-                "to_base": {
-                    "milliliters": 1, "centiliters": 10, "deciliters": 100,
-                    "liters": 1000, "gallons": 3785.41, "cups": 236.588,
-                    "quarts": 946.353, "pints": 473.176
-                }
-            },
-            "Computer Storage": {
-                "units": ["bytes", "kilobytes", "megabytes", "gigabytes", "terabytes"],
-                "to_base": {
-                    "bytes": 1, "kilobytes": 1024, "megabytes": 1024**2,
-                    "gigabytes": 1024**3, "terabytes": 1024**4
-                }
-            },
-            "Power": {
-                "units": ["watts", "kilowatts", "horsepower", "megawatts"],
-                "to_base": {
-                    "watts": 1, "kilowatts": 1000, "horsepower": 745.7, "megawatts": 1_000_000
-                }
-            },
-            "Pressure": {
-                "units": ["pascals", "bar", "atm", "psi", "torr"],
-                "to_base": {
-                    "pascals": 1, "bar": 100000, "atm": 101325,
-                    "psi": 6894.76, "torr": 133.322
-                }
-            },
-            "Energy": {
-                "units": ["joules", "kilojoules", "calories", "kilocalories", "watt-hours", "kilowatt-hours"],
-                "to_base": {
-                    "joules": 1, "kilojoules": 1000, "calories": 4.184,
-                    "kilocalories": 4184, "watt-hours": 3600, "kilowatt-hours": 3.6e6
-                }
-            }
-        }
+
+    def __init__(self, plan_cache_size=1024, registry=None):
+        # Unit tables are frozen and shared process-wide; only caches and hooks are per instance
+        self.registry = registry or get_registry()
+        self._resolve = self.registry.resolve
+        # Bounded LRU of compiled plans, keyed by (from_unit, to_unit, conversion_type)
+        self._plan_cache = lru_cache(maxsize=plan_cache_size)(self._build_plan)
+        self._hooks = ()
+
+    @property
+    def unit_mappings(self):
+        """Read-only unit definitions by conversion type"""
+        return self.registry.unit_mappings
+
+    @property
+    def conversion_tables(self):
+        """Read-only factor/offset tables by conversion type"""
+        return self.registry.tables
+
+    def lookup_unit(self, unit):
+        """Resolve a unit name, alias or prefixed unit
+
+        Returns (conversion_type, canonical unit, factor), or None if the
+        name is unknown.
+        """
+        return self.registry.lookup_unit(unit)
+
+    def find_conversion_type(self, unit):
+        """Get the conversion type of a unit name or alias, or None"""
+        return self.registry.find_conversion_type(unit)
+
+    def canonical_unit(self, unit):
+        """Get the canonical unit name for a unit name or alias, or None"""
+        return self.registry.canonical_unit(unit)
+
+    def get_unit_ids(self, conversion_type):
+        """Get the name -> integer id mapping used by convert_by_id"""
+        if conversion_type in self.conversion_tables:
+            return dict(self.conversion_tables[conversion_type]["ids"])
+        return {}
+
+    def convert_by_id(self, value, from_id, to_id, conversion_type):
+        """Convert a value (or ndarray) between units resolved with get_unit_ids"""
+        table = self.conversion_tables[conversion_type]
+        if isinstance(value, np.ndarray):
+            return value * table["factors"][from_id, to_id] + table["offsets"][from_id, to_id]
+        return value * table["factor_rows"][from_id][to_id] + table["offset_rows"][from_id][to_id]
+
+    def compile(self, from_unit, to_unit, conversion_type=None):
+        """Return a cached ConversionPlan for a unit pair
+
+        Validation happens once when the plan is built; raises ValueError for
+        an unsupported conversion type or unknown units.
+        """
+        return self._plan_cache(from_unit, to_unit, conversion_type)
+
+    def plan_cache_info(self):
+        """Get hit/miss counters of the compiled plan cache"""
+        info = self._plan_cache.cache_info()
+        return {"hits": info.hits, "misses": info.misses,
+                "size": info.currsize, "maxsize": info.maxsize}
+
+    def clear_plan_cache(self):
+        """Drop all compiled plans and reset the counters"""
+        self._plan_cache.cache_clear()
+
+    def _build_plan(self, from_unit, to_unit, conversion_type):
+        return self.registry.compile(from_unit, to_unit, conversion_type)
 
     def convert_temperature(self, value, from_unit, to_unit):
-        """Special temperature conversion handling"""
-        if from_unit == to_unit:
-            return value
-        
-        if from_unit == "Celsius":
-            if to_unit == "Fahrenheit":
-                return (value * 9/5) + 32
-            elif to_unit == "Kelvin":
-                return value + 273.15
-        elif from_unit == "Fahrenheit":
-            if to_unit == "Celsius":
-                return (value - 32) * 5/9
-            elif to_unit == "Kelvin":
-                return ((value - 32) * 5/9) + 273.15
-        elif from_unit == "Kelvin":
-            if to_unit == "Celsius":
-                return value - 273.15
-            elif to_unit == "Fahrenheit":
-                return ((value - 273.15) * 9/5) + 32
-        
-        return value
-
-    def convert_units(self, value, from_unit, to_unit, conversion_type):
-        """Convert units based on the conversion type"""
+        """Temperature conversion through the affine Temperature table
+
+        Accepts a scalar or ndarray; raises ValueError for unknown units.
+        """
+        _, scale, offset = self._resolve(from_unit, to_unit, "Temperature")
+        return value * scale + offset
+
+    def convert_units(self, value, from_unit, to_unit, conversion_type=None):
+        """Convert units based on the conversion type
+
+        When conversion_type is omitted it is resolved from from_unit; unit
+        aliases such as "kilometre" and prefixed units such as "nm" are accepted.
+        """
+        try:
+            value = float(value)
+        except (ValueError, TypeError):
+            return {"error": "Invalid input value"}
+
+        # Linear and affine categories share the precomputed factor/offset matrices
+        try:
+            _, scale, offset = self._resolve(from_unit, to_unit, conversion_type)
+        except ValueError as e:
+            return {"error": str(e)}
+
+        result = value * scale + offset
+
+        return ConversionResult(value, from_unit, to_unit, result)
+
+    def parse_compound(self, unit):
+        """Parse a compound unit such as "km/h" or "W/m²" (cached)
+
+        Returns a CompoundUnit; raises ValueError for unknown units.
+        """
+        return self.registry.dimensions.parse(unit)
+
+    def convert_compound(self, value, from_unit, to_unit):
+        """Convert between compound units with matching dimensions"""
         try:
             value = float(value)
         except (ValueError, TypeError):
             return {"error": "Invalid input value"}
 
-        if conversion_type not in self.unit_mappings:
+        try:
+            source = self.registry.dimensions.parse(from_unit)
+            target = self.registry.dimensions.parse(to_unit)
+        except ValueError as e:
+            return {"error": str(e)}
+
+        if source.dimensions != target.dimensions:
+            return {"error": f"Incompatible dimensions: {format_dimensions(source.dimensions)} "
+                             f"and {format_dimensions(target.dimensions)}"}
+        return ConversionResult(value, from_unit, to_unit, value * (source.scale / target.scale))
+
+    def compile_expression(self, expression):
+        """Compile a conversion expression such as "5 km + 300 m in miles" (cached)
+
+        Returns a CompiledExpression; raises ValueError if it cannot be parsed.
+        """
+        return self.registry.expressions.compile(expression)
+
+    def evaluate_expression(self, expression, default_unit=None, target=None, **variables):
+        """Evaluate a conversion expression
+
+        A dimensionless expression ("2 * 3.5") is read in default_unit when
+        given; target is used when the expression names no unit to convert
+        to. Variables may be scalars or NumPy arrays.
+        """
+        try:
+            compiled = self.registry.expressions.compile(expression)
+            if compiled.is_dimensionless and default_unit is not None:
+                value, _ = compiled.evaluate(**variables)
+                if target is None:
+                    return {"result": value, "unit": default_unit,
+                            "formatted": f"{expression} = {value:,.4f} {default_unit}"}
+                result = self.compile(default_unit, target)(value)
+                unit = target
+            elif compiled.target_name is None and target is not None:
+                compiled = self.registry.expressions.compile(f"{expression} in {target}")
+                result, unit = compiled.evaluate(**variables)
+            else:
+                result, unit = compiled.evaluate(**variables)
+        except (ValueError, ZeroDivisionError) as e:
+            return {"error": str(e)}
+
+        if isinstance(result, np.ndarray):
+            return {"result": result, "unit": unit}
+        suffix = f" {unit}" if unit != "1" else ""
+        return {"result": result, "unit": unit, "formatted": f"{expression} = {result:,.4f}{suffix}"}
+
+    def convert_many(self, values, from_unit, to_unit, conversion_type=None):
+        """Convert a batch of values in one vectorized operation
+
+        Accepts NumPy arrays, array.array or any buffer-protocol / sequence of
+        numbers. Returns {"result": ndarray, "invalid": bool mask}; entries
+        that could not be parsed or are not finite are flagged in the mask
+        and set to NaN in the result.
+        """
+        try:
+            _, scale, offset = self._resolve(from_unit, to_unit, conversion_type)
+        except ValueError as e:
+            return {"error": str(e)}
+
+        values = self._as_float_array(values)
+        invalid = ~np.isfinite(values)
+
+        result = values * scale + offset
+        result[invalid] = np.nan
+        return {"result": result, "invalid": invalid}
+
+    def convert_threaded(self, values, from_unit, to_unit, conversion_type=None,
+                         workers=None, chunk_size=DEFAULT_THREAD_CHUNK_SIZE):
+        """Convert a batch like convert_many, split across a shared thread pool
+
+        Suited to medium batches (10k-1M values) where a process pool costs
+        more in serialization than it saves. Each thread runs NumPy kernels
+        on its own slice of preallocated outputs, so the GIL is released
+        while converting and the work scales on free-threaded builds.
+        workers caps the number of slices (default: all cores).
+        """
+        try:
+            _, scale, offset = self._resolve(from_unit, to_unit, conversion_type)
+        except ValueError as e:
+            return {"error": str(e)}
+
+        # C-ordered input and outputs, so the flat views below share their memory
+        values = np.ascontiguousarray(self._as_float_array(values))
+        result = np.empty(values.shape)
+        invalid = np.empty(values.shape, dtype=bool)
+        flat_values, flat_result, flat_invalid = values.reshape(-1), result.reshape(-1), invalid.reshape(-1)
+
+        workers = workers or os.cpu_count() or 1
+        slices = min(workers, max(1, values.size // max(1, chunk_size)))
+        if slices <= 1:
+            _convert_slice(flat_values, flat_result, flat_invalid, 0, values.size, scale, offset)
+            return {"result": result, "invalid": invalid}
+
+        bounds = np.linspace(0, values.size, slices + 1, dtype=np.int64)
+        pool = _get_thread_pool()
+        futures = [pool.submit(_convert_slice, flat_values, flat_result, flat_invalid,
+                               int(start), int(stop), scale, offset)
+                   for start, stop in zip(bounds[:-1], bounds[1:])]
+        for future in futures:
+            future.result()
+        return {"result": result, "invalid": invalid}
+
+    def convert_to_all(self, values, from_unit, conversion_type=None):
+        """Express a value (or batch) in every unit of its category at once
+
+        Computed as one broadcast of the values against the category's
+        factor/offset row for from_unit. Returns {"result": 2-D ndarray of
+        shape (values, units), "units": get_units_for_type() order,
+        "invalid": bool mask per value}; invalid rows are NaN.
+        """
+        if conversion_type is None:
+            conversion_type = self.find_conversion_type(from_unit)
+            if conversion_type is None:
+                return {"error": "Unknown unit"}
+        table = self.conversion_tables.get(conversion_type)
+        if table is None:
             return {"error": "Unsupported conversion type"}
 
-        # Special handling for temperature
-        if conversion_type == "Temperature":
-            result = self.convert_temperature(value, from_unit, to_unit)
-            return {
-                "result": result,
-                "formatted": f"{value} {from_unit} = {result:.4f} {to_unit}"
-            }
-
-        # Standard conversion using base units
-        unit_data = self.unit_mappings[conversion_type]
-        
-        if from_unit not in unit_data["to_base"] or to_unit not in unit_data["to_base"]:
-            return {"error": "Invalid units for conversion"}
-
-        # Convert to base unit, then to target unit
-        base_value = value * unit_data["to_base"][from_unit]
-        result = base_value / unit_data["to_base"][to_unit]
-
-        return {
-            "result": result,
-            "formatted": f"{value} {from_unit} = {result:,.4f} {to_unit}"
-        }
+        from_id = table["ids"].get(from_unit)
+        factor = 1.0
+        if from_id is None:
+            try:
+                from_id, factor = self.registry._unit_id(from_unit, conversion_type, table["ids"])
+            except ValueError as e:
+                return {"error": str(e)}
+
+        columns = table["unit_columns"]
+        scales = table["factors"][from_id, columns]
+        offsets = table["offsets"][from_id, columns]
+        if factor != 1.0:
+            scales = scales * factor
+
+        values = self._as_float_array(values).reshape(-1)
+        invalid = ~np.isfinite(values)
+        result = values[:, None] * scales + offsets
+        result[invalid] = np.nan
+        return {"result": result, "units": self.get_units_for_type(conversion_type), "invalid": invalid}
+
+    @staticmethod
+    def _as_float_array(values):
+        """Coerce a batch input into a float64 array, NaN for bad entries"""
+        try:
+            return np.atleast_1d(np.asarray(values, dtype=np.float64))
+        except (ValueError, TypeError):
+            pass
+
+        out = np.empty(len(values), dtype=np.float64)
+        for i, item in enumerate(values):
+            try:
+                out[i] = float(item)
+            except (ValueError, TypeError):
+                out[i] = np.nan
+        return out
+
+    # -------------------- Instrumentation hooks -------------------- #
+
+    # Public methods wrapped while at least one hook is registered
+    _instrumented = ("convert_units", "convert_temperature", "convert_many", "convert_threaded")
+
+    def add_hook(self, hook):
+        """Register hook(operation, conversion_type, from_unit, to_unit, elapsed_ns, count)
+
+        The hook is called after every convert_units, convert_temperature,
+        convert_many and convert_threaded call; count is the number of values converted. Timing
+        wrappers are only installed while a hook is registered, so an
+        instance without hooks runs the plain methods.
+        """
+        if not self._hooks:
+            for name in self._instrumented:
+                setattr(self, name, self._instrument(name))
+        self._hooks = (*self._hooks, hook)
+
+    def remove_hook(self, hook):
+        """Unregister a hook added with add_hook"""
+        self._hooks = tuple(h for h in self._hooks if h is not hook)
+        if not self._hooks:
+            self.clear_hooks()
+
+    def clear_hooks(self):
+        """Unregister all hooks and restore the uninstrumented methods"""
+        self._hooks = ()
+        for name in self._instrumented:
+            self.__dict__.pop(name, None)
+
+    def _instrument(self, name):
+        method = getattr(type(self), name).__get__(self)
+        clock = time.perf_counter_ns
+
+        @wraps(method)
+        def instrumented(*args, **kwargs):
+            start = clock()
+            result = method(*args, **kwargs)
+            elapsed = clock() - start
+
+            # Arguments are passed through untouched; pick out the labels the
+            # way the wrapped method binds them (value, from_unit, to_unit, conversion_type)
+            from_unit = args[1] if len(args) > 1 else kwargs.get("from_unit")
+            to_unit = args[2] if len(args) > 2 else kwargs.get("to_unit")
+            if name == "convert_temperature":
+                conversion_type = "Temperature"
+            else:
+                conversion_type = args[3] if len(args) > 3 else kwargs.get("conversion_type")
+            if conversion_type is None:
+                conversion_type = self.find_conversion_type(from_unit)
+            if name == "convert_temperature":
+                count = int(np.size(result))
+            elif "error" in result:
+                count = 0
+            else:
+                count = 1 if name == "convert_units" else result["result"].size
+            for hook in self._hooks:
+                hook(name, conversion_type, from_unit, to_unit, elapsed, count)
+            return result
+
+        return instrumented
 
     #New
     def convert_units_bug(self, value, from_unit, to_unit, conversion_type):
@@ -155,5 +449,5 @@ class UnitConverterCore:
     def get_units_for_type(self, conversion_type):
         """Get available units for a conversion type"""
         if conversion_type in self.unit_mappings:
-            return self.unit_mappings[conversion_type]["units"]
+            return list(self.unit_mappings[conversion_type]["units"])
         return []
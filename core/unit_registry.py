@@ -0,0 +1,389 @@
+# core/unit_registry.py
+
+"""
+Unit definitions loading with a precompiled on-disk cache.
+
+Units are defined in core/units.json. Extra unit packs can be layered on
+top through the UNIT_DEFINITIONS environment variable (paths separated by
+os.pathsep); a pack may add categories or extend existing ones.
+
+Compiling the definitions (unit index, prefix bases, factor/offset
+matrices) is done once per distinct set of sources and stored as a marshal
+file named after the SHA-256 of the sources, so later startups load the
+precomputed tables and any edit to a source file invalidates the cache.
+
+get_registry() loads each set of sources once per process into a frozen
+UnitRegistry (MappingProxyType/tuples/read-only arrays) that every
+UnitConverterCore shares, so constructing a converter costs next to nothing
+and the tables can be read from any thread without locking.
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import sys
+import tempfile
+import threading
+from fractions import Fraction
+from types import MappingProxyType
+
+import numpy as np
+
+from core.dimensions import DimensionRegistry
+from core.expressions import ExpressionCompiler
+from core.prefixes import split_prefix
+
+DEFAULT_DEFINITIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "units.json")
+# Bump whenever the compiled layout or the table arithmetic changes
+CACHE_FORMAT = 2
+
+
+def definition_paths():
+    """Get the built-in definitions file followed by UNIT_DEFINITIONS packs"""
+    extra = os.getenv("UNIT_DEFINITIONS", "")
+    return [DEFAULT_DEFINITIONS_PATH] + [path for path in extra.split(os.pathsep) if path.strip()]
+
+
+def default_cache_dir():
+    """Get the compiled cache directory (UNIT_CACHE_DIR, else the user cache dir)"""
+    configured = os.getenv("UNIT_CACHE_DIR")
+    if configured:
+        return configured
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "professional_unit_converter")
+
+
+def merge_definitions(base, extra):
+    """
+    Layer a unit pack over existing definitions.
+
+    New categories are added; for existing ones, new units are appended and
+    the to_base/offset/aliases/prefixes maps are updated.
+    """
+    merged = {name: {key: (list(value) if isinstance(value, list) else dict(value))
+                     for key, value in data.items()}
+              for name, data in base.items()}
+    for name, data in extra.items():
+        if name not in merged:
+            merged[name] = data
+            continue
+        category = merged[name]
+        for unit in data.get("units", []):
+            if unit not in category["units"]:
+                category["units"].append(unit)
+        for key in ("to_base", "offset", "aliases", "prefixes"):
+            if key in data:
+                category.setdefault(key, {}).update(data[key])
+    return merged
+
+
+def build_conversion_tables(unit_mappings):
+    """
+    Precompute a dense from x to factor/offset matrix for each category.
+
+    Units are numbered in the order of their "to_base" entries, so that
+    a conversion becomes value * factors[from_id][to_id] + offsets[from_id][to_id].
+    Linear categories have all-zero offsets; affine ones (Temperature) carry
+    an "offset" map next to "to_base". Only plain lists are returned so the
+    result can be marshalled.
+
+    Definitions are read as the decimals written in the file and each pair
+    is computed exactly with Fraction, so every factor/offset is rounded to
+    float once (feet -> inch is 12.0, Celsius -> Fahrenheit adds exactly 32).
+    """
+    tables = {}
+    for conversion_type, unit_data in unit_mappings.items():
+        to_base = unit_data["to_base"]
+        names = list(to_base)
+        scale = [Fraction(repr(float(to_base[name]))) for name in names]
+        base_offset = [Fraction(repr(float(unit_data.get("offset", {}).get(name, 0))))
+                       for name in names]
+
+        # base = value * scale[i] + base_offset[i]; result = (base - base_offset[j]) / scale[j]
+        tables[conversion_type] = {
+            "ids": {name: unit_id for unit_id, name in enumerate(names)},
+            "factor_rows": [[float(scale[i] / scale[j]) for j in range(len(names))]
+                            for i in range(len(names))],
+            "offset_rows": [[float((base_offset[i] - base_offset[j]) / scale[j]) for j in range(len(names))]
+                            for i in range(len(names))],
+        }
+    return tables
+
+
+def build_unit_index(unit_mappings):
+    """
+    Index every unit name and alias by its category.
+
+    Entries are (conversion_type, canonical unit, factor). Raises ValueError
+    if a name would resolve to two different units, so ambiguities surface
+    when the index is built rather than on lookup.
+    """
+    index = {}
+    for conversion_type, unit_data in unit_mappings.items():
+        aliases = unit_data.get("aliases", {})
+        for unit in unit_data["units"]:
+            for name in [unit, *aliases.get(unit, [])]:
+                entry = (conversion_type, unit, 1.0)
+                if index.setdefault(name, entry) != entry:
+                    raise ValueError(f"Ambiguous unit name {name!r}: "
+                                     f"{index[name]} and {entry}")
+    return index
+
+
+def build_prefix_bases(unit_mappings, index):
+    """Collect the unit names that accept SI/IEC prefixes, by rule"""
+    bases = {}
+    for conversion_type, unit_data in unit_mappings.items():
+        for name, rule in unit_data.get("prefixes", {}).items():
+            entry = index.get(name)
+            if entry is None or entry[0] != conversion_type:
+                raise ValueError(f"Prefix base {name!r} is not a {conversion_type} unit")
+            if unit_data.get("offset", {}).get(entry[1], 0):
+                raise ValueError(f"Prefix base {name!r} has an offset")
+            bases[name] = rule
+    return bases
+
+
+def compile_definitions(unit_mappings):
+    """Compile definitions into the marshal-able registry layout"""
+    index = build_unit_index(unit_mappings)
+    return {
+        "unit_mappings": unit_mappings,
+        "tables": build_conversion_tables(unit_mappings),
+        "index": index,
+        "prefix_bases": build_prefix_bases(unit_mappings, index),
+    }
+
+
+def _read_sources(paths):
+    sources = []
+    for path in paths:
+        with open(path, "rb") as f:
+            sources.append(f.read())
+    return sources
+
+
+def _cache_key(sources):
+    digest = hashlib.sha256(f"{CACHE_FORMAT}:{sys.version_info[0]}.{sys.version_info[1]}".encode())
+    for source in sources:
+        digest.update(len(source).to_bytes(8, "little"))
+        digest.update(source)
+    return digest.hexdigest()
+
+
+def _write_cache(cache_path, compiled):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(marshal.dumps(compiled))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # A read-only or missing cache directory only costs startup time
+        pass
+
+
+def load_registry(paths=None, cache_dir=None, use_cache=True):
+    """
+    Load compiled unit definitions, from the on-disk cache when possible.
+
+    Args:
+        paths (list): Definition files, layered in order; defaults to
+            definition_paths().
+        cache_dir (str): Cache directory; defaults to default_cache_dir().
+        use_cache (bool): Set to False to always compile from source.
+
+    Returns:
+        dict: {"unit_mappings", "tables", "index", "prefix_bases"} as plain
+        mutable containers; see get_registry() for the shared frozen form.
+    """
+    paths = paths or definition_paths()
+    sources = _read_sources(paths)
+
+    compiled = None
+    cache_path = None
+    if use_cache:
+        cache_path = os.path.join(cache_dir or default_cache_dir(), f"units-{_cache_key(sources)}.marshal")
+        try:
+            with open(cache_path, "rb") as f:
+                compiled = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            compiled = None
+
+    if compiled is None:
+        unit_mappings = {}
+        for path, source in zip(paths, sources):
+            try:
+                definitions = json.loads(source.decode("utf-8"))
+            except ValueError as e:
+                raise ValueError(f"Invalid unit definitions in {path}: {e}") from None
+            unit_mappings = merge_definitions(unit_mappings, definitions)
+        compiled = compile_definitions(unit_mappings)
+        if cache_path:
+            _write_cache(cache_path, compiled)
+    return compiled
+
+
+def freeze(value):
+    """Recursively turn dicts into MappingProxyType views and lists into tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    return value
+
+
+class ConversionPlan:
+    """Reusable, pre-validated conversion between two units
+
+    Calling the plan applies value * scale + offset, which works for both
+    scalars and NumPy arrays.
+    """
+
+    __slots__ = ("conversion_type", "from_unit", "to_unit", "scale", "offset")
+
+    def __init__(self, conversion_type, from_unit, to_unit, scale, offset):
+        self.conversion_type = conversion_type
+        self.from_unit = from_unit
+        self.to_unit = to_unit
+        self.scale = scale
+        self.offset = offset
+
+    def __call__(self, value):
+        return value * self.scale + self.offset
+
+    def __repr__(self):
+        return (f"ConversionPlan({self.conversion_type!r}, {self.from_unit!r} -> {self.to_unit!r}, "
+                f"scale={self.scale!r}, offset={self.offset!r})")
+
+
+class UnitRegistry:
+    """
+    Immutable compiled unit definitions, shared by all converters.
+
+    unit_mappings, tables, index and prefix_bases are read-only views. The
+    only mutable state are memo caches (prefixed units, parsed compound
+    units, compiled expressions) whose entries are derived from the frozen
+    data, so a lost race merely computes the same entry twice.
+    """
+
+    def __init__(self, compiled):
+        for conversion_type, table in compiled["tables"].items():
+            table["factors"] = np.array(table["factor_rows"], dtype=np.float64)
+            table["offsets"] = np.array(table["offset_rows"], dtype=np.float64)
+            # Table ids in the order of the category's "units" list
+            units = compiled["unit_mappings"][conversion_type]["units"]
+            table["unit_columns"] = np.array([table["ids"][unit] for unit in units], dtype=np.intp)
+        self.unit_mappings = freeze(compiled["unit_mappings"])
+        self.tables = freeze(compiled["tables"])
+        self.index = freeze(compiled["index"])
+        self.prefix_bases = freeze(compiled["prefix_bases"])
+        self._generated_units = {}
+        self.dimensions = DimensionRegistry(self)
+        self.expressions = ExpressionCompiler(self)
+
+    def lookup_unit(self, unit):
+        """Resolve a unit name, alias or prefixed unit
+
+        Returns (conversion_type, canonical unit, factor) where one `unit`
+        equals factor canonical units, or None if the name is unknown.
+        Prefixed units ("nm", "KiB") are synthesized on first lookup and
+        memoized, so later lookups cost one dict hit like literal names.
+        """
+        entry = self.index.get(unit)
+        if entry is None:
+            entry = self._generated_units.get(unit)
+            if entry is None:
+                entry = self._generate_prefixed(unit)
+        return entry
+
+    def _generate_prefixed(self, unit):
+        split = split_prefix(unit, self.prefix_bases)
+        if split is None:
+            return None
+        base, factor = split
+        conversion_type, canonical, base_factor = self.index[base]
+        entry = (conversion_type, canonical, factor * base_factor)
+        self._generated_units[unit] = entry
+        return entry
+
+    def find_conversion_type(self, unit):
+        """Get the conversion type of a unit name or alias, or None"""
+        entry = self.lookup_unit(unit)
+        return entry[0] if entry else None
+
+    def canonical_unit(self, unit):
+        """Get the canonical unit name for a unit name or alias, or None"""
+        entry = self.lookup_unit(unit)
+        return entry[1] if entry else None
+
+    def parse_compound(self, unit):
+        """Parse a compound unit such as "km/h" (cached); raises ValueError"""
+        return self.dimensions.parse(unit)
+
+    def resolve(self, from_unit, to_unit, conversion_type):
+        """Resolve a unit pair to (conversion_type, scale, offset)
+
+        conversion_type may be None, in which case it is looked up from
+        from_unit. Raises ValueError with the user-facing error message.
+        """
+        if conversion_type is None:
+            conversion_type = self.find_conversion_type(from_unit)
+            if conversion_type is None:
+                raise ValueError("Unknown unit")
+
+        table = self.tables.get(conversion_type)
+        if table is None:
+            raise ValueError("Unsupported conversion type")
+
+        ids = table["ids"]
+        from_id = ids.get(from_unit)
+        to_id = ids.get(to_unit)
+        if from_id is not None and to_id is not None:
+            return conversion_type, table["factor_rows"][from_id][to_id], table["offset_rows"][from_id][to_id]
+
+        # Aliases and prefixed units are scaled relative to their canonical unit
+        from_factor = to_factor = 1.0
+        if from_id is None:
+            from_id, from_factor = self._unit_id(from_unit, conversion_type, ids)
+        if to_id is None:
+            to_id, to_factor = self._unit_id(to_unit, conversion_type, ids)
+        scale = table["factor_rows"][from_id][to_id] * from_factor / to_factor
+        offset = table["offset_rows"][from_id][to_id] / to_factor
+        return conversion_type, scale, offset
+
+    def _unit_id(self, unit, conversion_type, ids):
+        entry = self.lookup_unit(unit)
+        if entry is None or entry[0] != conversion_type:
+            raise ValueError("Invalid units for conversion")
+        return ids[entry[1]], entry[2]
+
+    def compile(self, from_unit, to_unit, conversion_type=None):
+        """Build an (uncached) ConversionPlan; raises ValueError"""
+        conversion_type, scale, offset = self.resolve(from_unit, to_unit, conversion_type)
+        return ConversionPlan(conversion_type, from_unit, to_unit, scale, offset)
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(paths=None):
+    """
+    Get the process-wide UnitRegistry for a set of definition files.
+
+    The registry is loaded on first use and reused afterwards; the lock only
+    guards that first load.
+    """
+    key = tuple(paths or definition_paths())
+    registry = _registries.get(key)
+    if registry is None:
+        with _registries_lock:
+            registry = _registries.get(key)
+            if registry is None:
+                registry = UnitRegistry(load_registry(list(key)))
+                _registries[key] = registry
+    return registry
@@ -119,7 +119,7 @@ class HelpDialog(QDialog):
                 <ul>
                     <li><b>Distance:</b> mm, cm, m, km, miles, yards, feet, inch</li>
                     <li><b>Time:</b> seconds, minutes, hours, days, years, decades, centuries</li>
-                    <li><b>Temperature:</b> Celsius, Fahrenheit, Kelvin</li>
+                    <li><b>Temperature:</b> Celsius, Fahrenheit, Kelvin, Rankine, Réaumur</li>
                     <li><b>Mass:</b> grams, kilograms, milligrams, pounds, ounces, ton</li>
                     <li><b>Volume:</b> milliliters, centiliters, deciliters, liters, gallons, cups, quarts, pints</li>
                     <li><b>Computer Storage:</b> bytes, kilobytes, megabytes, gigabytes, terabytes</li>
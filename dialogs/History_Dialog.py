@@ -1,26 +1,35 @@
 from PyQt5.QtWidgets import (
-    QDialog, QVBoxLayout, QLabel, QListWidget, QListWidgetItem,
-    QPushButton, QHBoxLayout, QFileDialog, QMessageBox
+    QDialog, QVBoxLayout, QLabel, QLineEdit, QTableView, QAbstractItemView,
+    QHeaderView, QPushButton, QHBoxLayout, QMessageBox
 )
 from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt
-import json
-from datetime import datetime
+from PyQt5.QtCore import Qt, QTimer
+
+from ui.history_export import start_history_export
+from ui.history_model import HistoryTableModel
 
 
 class HistoryDialog(QDialog):
     """Dialog to show conversion history"""
 
-    def __init__(self, history, parent=None):
+    def __init__(self, history, parent=None, database=None, export=None):
         super().__init__(parent)
         self.history = history
+        self.database = database
+        # Callback that exports from the main window, so the export outlives the dialog
+        self.export = export
+        self.export_worker = None
+        if self.database is not None:
+            # Make entries still queued for the writer thread visible
+            self.database.flush()
         self.setWindowTitle("Conversion History")
         self.setFixedSize(600, 500)
         self.setModal(True)
 
         layout = QVBoxLayout()
         layout.addWidget(self._create_title())
-        layout.addWidget(self._create_history_list())
+        layout.addWidget(self._create_search_box())
+        layout.addWidget(self._create_history_table())
         layout.addLayout(self._create_buttons())
         self.setLayout(layout)
 
@@ -30,10 +39,33 @@ class HistoryDialog(QDialog):
         title.setFont(QFont("Arial", 14, QFont.Bold))
         return title
 
-    def _create_history_list(self):
-        self.history_list = QListWidget()
-        self._populate_history()
-        return self.history_list
+    def _create_search_box(self):
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search by type, unit or value")
+        self.search_box.setClearButtonEnabled(True)
+        # Debounce typing so only the last keystroke runs a query
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self._apply_search)
+        self.search_box.textChanged.connect(lambda: self.search_timer.start(200))
+        return self.search_box
+
+    def _create_history_table(self):
+        self.history_model = HistoryTableModel(self.database, self.history, parent=self)
+        self.history_table = QTableView()
+        self.history_table.setModel(self.history_model)
+        self.history_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.history_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.history_table.setAlternatingRowColors(True)
+        self.history_table.verticalHeader().setVisible(False)
+        self.history_table.verticalHeader().setDefaultSectionSize(22)
+        header = self.history_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setStretchLastSection(True)
+        self.history_table.setColumnWidth(0, 150)
+        self.history_table.setColumnWidth(1, 120)
+        self.history_model.fetchMore()
+        return self.history_table
 
     def _create_buttons(self):
         layout = QHBoxLayout()
@@ -52,36 +84,29 @@ class HistoryDialog(QDialog):
 
         return layout
 
-    def _populate_history(self):
-        """Populate the history list"""
-        self.history_list.clear()
-        for item in self.history:
-            timestamp = item.get("timestamp", "Unknown")
-            conversion = item.get("formatted", "Unknown conversion")
-            conv_type = item.get("type", "Unknown")
-            entry = f"[{timestamp}] {conv_type}: {conversion}"
-            self.history_list.addItem(QListWidgetItem(entry))
+    def done(self, result):
+        # A running export must not outlive the dialog that owns its thread
+        if self.export_worker is not None and self.export_worker.isRunning():
+            self.export_worker.cancel()
+            self.export_worker.wait()
+            QMessageBox.information(self, "Export History", "History export cancelled")
+        super().done(result)
+
+    def _apply_search(self):
+        """Filter the history table by the search box text"""
+        self.history_model.set_query(self.search_box.text())
+        self.history_model.fetchMore()
 
     def _export_history(self):
-        """Export history to a JSON file"""
+        """Export history to a JSON Lines or CSV file in the background"""
         if not self.history:
             QMessageBox.warning(self, "Warning", "No history to export!")
             return
 
-        filename, _ = QFileDialog.getSaveFileName(
-            self,
-            "Export History",
-            f"conversion_history_{datetime.now().strftime('%Y%m%d')}.json",
-            "JSON Files (*.json)"
-        )
-
-        if filename:
-            try:
-                with open(filename, 'w') as f:
-                    json.dump(self.history, f, indent=2, default=str)
-                QMessageBox.information(self, "Success", f"History exported to {filename}")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to export history:\n{str(e)}")
+        if self.export is not None:
+            self.export()
+        else:
+            self.export_worker = start_history_export(self, self.database, self.history)
 
     def _clear_history(self):
         """Clear conversion history"""
@@ -93,5 +118,9 @@ class HistoryDialog(QDialog):
         )
         if confirm == QMessageBox.Yes:
             self.history.clear()
-            self._populate_history()
+            if self.database is not None:
+                self.database.clear()
+                self.database.flush()
+            self.history_model.refresh()
+            self.history_model.fetchMore()
             QMessageBox.information(self, "Success", "History cleared successfully!")
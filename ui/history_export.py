@@ -0,0 +1,104 @@
+# ui/history_export.py
+
+"""
+Background history export for the main window and the History dialog.
+
+The export runs core.history_export.export_history in a QThread that
+streams entries from the SQLite history (or a snapshot of the in-memory
+store), while a QProgressDialog shows progress and can cancel it.
+"""
+
+import threading
+from datetime import datetime
+
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+
+from core.history_export import ExportCancelled, export_format_for_path, export_history
+
+EXPORT_FILTERS = "JSON Lines (*.jsonl);;CSV Files (*.csv)"
+
+
+class HistoryExportWorker(QThread):
+    """Streams history to a file off the GUI thread"""
+
+    progress = pyqtSignal(int, int)
+    exported = pyqtSignal(int, str)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, path, database=None, entries=None, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.database = database
+        # Without a database, export a snapshot so the GUI can keep adding entries
+        self.entries = list(entries) if entries is not None else []
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        if self.database is not None:
+            entries, total = self.database.iter_entries(), self.database.count()
+        else:
+            entries, total = self.entries, len(self.entries)
+            self.entries = []
+        try:
+            written = export_history(entries, self.path, export_format_for_path(self.path), total,
+                                     progress=self.progress.emit, cancelled=self._cancel.is_set)
+        except ExportCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.exported.emit(written, self.path)
+
+
+def start_history_export(parent, database=None, history=None, on_finished=None):
+    """
+    Ask for a target file and export the history in the background.
+
+    on_finished(message) is called with a status message when the export
+    completes, fails or is cancelled. Returns the worker, or None if the
+    user dismissed the file dialog.
+    """
+    filename, _ = QFileDialog.getSaveFileName(
+        parent, "Export History",
+        f"conversion_history_{datetime.now().strftime('%Y%m%d')}.jsonl",
+        EXPORT_FILTERS
+    )
+    if not filename:
+        return None
+    if database is not None:
+        # Include entries still queued for the writer thread
+        database.flush()
+
+    worker = HistoryExportWorker(filename, database, None if database is not None else history, parent)
+    progress_dialog = QProgressDialog("Exporting history...", "Cancel", 0, 0, parent)
+    progress_dialog.setWindowTitle("Export History")
+    progress_dialog.setMinimumDuration(300)
+    progress_dialog.canceled.connect(worker.cancel)
+
+    def on_progress(written, total):
+        if total:
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(min(written, total))
+        progress_dialog.setLabelText(f"Exported {written:,} entries...")
+
+    def finish(message, failed=False):
+        progress_dialog.reset()
+        progress_dialog.deleteLater()
+        if failed:
+            QMessageBox.critical(parent, "Error", message)
+        else:
+            QMessageBox.information(parent, "Export History", message)
+        if on_finished is not None:
+            on_finished(message)
+
+    worker.progress.connect(on_progress)
+    worker.exported.connect(lambda written, path: finish(f"Exported {written:,} entries to {path}"))
+    worker.failed.connect(lambda error: finish(f"Failed to export history:\n{error}", failed=True))
+    worker.cancelled.connect(lambda: finish("History export cancelled"))
+    worker.start()
+    return worker
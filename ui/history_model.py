@@ -0,0 +1,153 @@
+# ui/history_model.py
+
+"""
+Qt item models for the conversion history.
+
+RecentConversionsModel backs the "Recent Conversions" panel. It wraps the
+window's newest-first HistoryStore and shows its first `limit` entries.
+New conversions go through insert_entry(), which emits one rowsInserted
+(and one rowsRemoved once the panel is full) instead of rebuilding the
+whole list, so typing with auto-convert does not repaint every row.
+
+HistoryTableModel backs the History dialog. Rows are paged in with
+canFetchMore/fetchMore as the view scrolls, from the SQLite history (or
+from an in-memory HistoryStore), so opening the dialog only formats the
+first page however long the history is.
+"""
+
+from itertools import islice
+
+from PyQt5.QtCore import QAbstractListModel, QAbstractTableModel, QModelIndex, Qt
+
+from core.history import HistoryStore
+from core.history_db import DEFAULT_PAGE_SIZE, SEARCH_COLUMNS
+
+
+class RecentConversionsModel(QAbstractListModel):
+    """List model over the most recent conversion history entries"""
+
+    def __init__(self, history=None, limit=5, parent=None):
+        super().__init__(parent)
+        self.limit = limit
+        self._history = history if history is not None else HistoryStore()
+        self._rows = min(len(self._history), limit)
+
+    @staticmethod
+    def format_entry(entry):
+        return f"[{entry.get('timestamp', '')}] {entry.get('formatted', '')}"
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= min(self._rows, len(self._history)):
+            return None
+        entry = self._history[index.row()]
+        if role == Qt.DisplayRole:
+            return self.format_entry(entry)
+        if role == Qt.ToolTipRole:
+            return entry.get("type")
+        return None
+
+    def insert_entry(self, entry):
+        """Insert a new entry at the top of the history and of the panel"""
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._history.add(entry)
+        self._rows += 1
+        self.endInsertRows()
+
+        # Rows pushed past the panel limit (or out of a full store) drop off the bottom
+        visible = min(len(self._history), self.limit)
+        if self._rows > visible:
+            self.beginRemoveRows(QModelIndex(), visible, self._rows - 1)
+            self._rows = visible
+            self.endRemoveRows()
+
+    def set_history(self, history):
+        """Replace the underlying history (e.g. after loading or clearing it)"""
+        self.beginResetModel()
+        self._history = history
+        self._rows = min(len(history), self.limit)
+        self.endResetModel()
+
+
+def matches_prefix(entry, text):
+    """In-memory equivalent of HistoryDatabase.search matching"""
+    text = text.casefold()
+    return any(str(entry.get(column) or "").casefold().startswith(text) for column in SEARCH_COLUMNS)
+
+
+class HistoryTableModel(QAbstractTableModel):
+    """Table model that fetches history pages on demand, optionally filtered"""
+
+    COLUMNS = (("Time", "created_at"), ("Type", "type"), ("Conversion", "formatted"))
+
+    def __init__(self, database=None, history=None, page_size=DEFAULT_PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.database = database
+        self.history = history if history is not None else HistoryStore()
+        self.page_size = page_size
+        self.query = ""
+        self._entries = []
+        self._exhausted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self._entries[index.row()]
+        if role == Qt.DisplayRole:
+            key = self.COLUMNS[index.column()][1]
+            if key == "created_at":
+                return (entry.get("created_at") or entry.get("timestamp", "")).replace("T", " ")
+            return entry.get(key, "")
+        if role == Qt.ToolTipRole:
+            return entry.get("formatted")
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][0]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        page = self._fetch_page()
+        if len(page) < self.page_size:
+            self._exhausted = True
+        if page:
+            first = len(self._entries)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self._entries.extend(page)
+            self.endInsertRows()
+
+    def set_query(self, text):
+        """Filter by type, unit or value prefix; rows are refetched lazily"""
+        self.beginResetModel()
+        self.query = text.strip()
+        self._entries = []
+        self._exhausted = False
+        self.endResetModel()
+
+    def refresh(self):
+        self.set_query(self.query)
+
+    def _fetch_page(self):
+        if self.database is not None:
+            before_id = self._entries[-1]["id"] if self._entries else None
+            return self.database.search(self.query, self.page_size, before_id)
+
+        entries = iter(self.history)
+        if self.query:
+            entries = (entry for entry in entries if matches_prefix(entry, self.query))
+        start = len(self._entries)
+        return list(islice(entries, start, start + self.page_size))
@@ -8,23 +8,29 @@ A comprehensive desktop unit converter with PyQt5 GUI
 import sys
 import os
 import json
+import math
+import sqlite3
 from datetime import datetime
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QComboBox, QLineEdit, QLabel, QPushButton, QCheckBox, QGroupBox,
-    QSplitter, QListWidget, QScrollArea,
-    QFileDialog, QStatusBar, QAction, QMessageBox, QSizePolicy
+    QSplitter, QListView, QScrollArea,
+    QStatusBar, QAction, QMessageBox, QSizePolicy
 )
-from PyQt5.QtGui import QIcon, QDoubleValidator, QKeySequence
+from PyQt5.QtGui import QIcon, QKeySequence
 from PyQt5.QtCore import Qt, QTimer, QSettings
 
+from core.history import HistoryStore
+from core.history_db import DEFAULT_PAGE_SIZE, HistoryDatabase
 from core.unit_conversion import UnitConverterCore
+from ui.history_export import start_history_export
+from ui.history_model import RecentConversionsModel
 from dialogs.About_Dialog import AboutDialog
 from dialogs.Help_Dialog import HelpDialog
 from dialogs.Donate_Dialog import DonateDialog
 from dialogs.History_Dialog import HistoryDialog
 from themes.apply_themes import get_dark_qss, get_light_qss
-from app_config.app_config import APP_NAME, APP_VERSION, ICON_PATH
+from app_config.app_config import APP_NAME, APP_VERSION, ICON_PATH, HISTORY_CAPACITY
 
 
 class ProfessionalUnitConverter(QMainWindow):
@@ -38,12 +44,21 @@ class ProfessionalUnitConverter(QMainWindow):
         self.setWindowIcon(QIcon(ICON_PATH))
         # Settings
         self.settings = QSettings("ProfessionalConverter", "UnitConverter")
-        self.conversion_history = []
+        # Recent page of history in memory; every entry is persisted incrementally to SQLite
+        self.conversion_history = HistoryStore(capacity=HISTORY_CAPACITY)
+        try:
+            self.history_db = HistoryDatabase()
+            history_db_error = None
+        except (sqlite3.Error, OSError) as e:
+            # Keep working with the in-memory history (saved to QSettings as before)
+            self.history_db = None
+            history_db_error = e
 
         # UI state
         self.dark_mode = True
         self.current_conversion_type = "Distance"
         self.last_result = None
+        self.export_worker = None
 
         # Initialize UI
         self.init_ui()
@@ -58,6 +73,10 @@ class ProfessionalUnitConverter(QMainWindow):
         self.populate_units()
         self.input_value.setFocus()
 
+        if history_db_error is not None:
+            self.set_status(f"[Status] History database unavailable ({history_db_error}); "
+                            "history is kept in memory")
+
     def init_ui(self):
         """Initialize the user interface"""
         self.setWindowTitle(f"{APP_NAME} {APP_VERSION}")
@@ -202,10 +221,8 @@ class ProfessionalUnitConverter(QMainWindow):
         form_layout.addWidget(self.conversion_type_combo)
 
         self.input_value = QLineEdit()
-        self.input_value.setPlaceholderText("Enter value")
-        validator = QDoubleValidator(bottom=-1e308, top=1e308, decimals=10)
-        validator.setNotation(QDoubleValidator.StandardNotation)
-        self.input_value.setValidator(validator)
+        # Accepts plain numbers and expressions such as "5 km + 300 m in miles"
+        self.input_value.setPlaceholderText("Enter value or expression")
         self.input_value.textChanged.connect(self.on_input_changed)
         self.input_value.returnPressed.connect(self.convert_units)
         form_layout.addWidget(QLabel("From:"))
@@ -248,7 +265,10 @@ class ProfessionalUnitConverter(QMainWindow):
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
 
-        self.recent_list = QListWidget()
+        self.recent_model = RecentConversionsModel(self.conversion_history, limit=5, parent=self)
+        self.recent_list = QListView()
+        self.recent_list.setUniformItemSizes(True)
+        self.recent_list.setModel(self.recent_model)
         scroll_area.setWidget(self.recent_list)
         recent_layout.addWidget(scroll_area)
         recent_group.setLayout(recent_layout)
@@ -340,34 +360,56 @@ class ProfessionalUnitConverter(QMainWindow):
             self.result_label.setText("0")
             self.set_status("[Status] Waiting for input...")
             return
+        conversion_type = self.current_conversion_type
         try:
             self.set_status("[Status] Converting...")
-            numeric_value = float(value)
-            result = self.converter.convert_units(numeric_value, from_unit, to_unit, self.current_conversion_type)
+            try:
+                numeric_value = float(value)
+            except ValueError:
+                result = self.converter.evaluate_expression(value, default_unit=from_unit, target=to_unit)
+                if 'error' not in result:
+                    if result['unit'] != to_unit:
+                        # The expression named its own target ("5 km + 300 m in miles")
+                        to_unit = result['unit']
+                        conversion_type = self.converter.find_conversion_type(to_unit) or "Unknown"
+                    if not self.converter.compile_expression(value).is_dimensionless:
+                        # Its units come from the expression, not from the "from" box
+                        from_unit = None
+            else:
+                if not math.isfinite(numeric_value):
+                    raise ValueError("Invalid input value")
+                result = self.converter.convert_units(numeric_value, from_unit, to_unit, conversion_type)
+            if 'error' in result:
+                raise ValueError(result['error'])
             numeric_result = float(result.get('result', 0))
+            if not math.isfinite(numeric_result):
+                raise ValueError("Result is out of range")
             self.result_label.setText(f"{numeric_result:,.4f}")
             self.last_result = result
-            self.add_to_history(result)
+            self.add_to_history(result, value, from_unit, to_unit, conversion_type)
             self.set_status(f"[Status] Conversion complete: {result['formatted']}")
         except Exception as e:
             self.result_label.setText("0")
             self.set_status(f"[Status] Error: {str(e)}")
 
-    def add_to_history(self, result):
+    def add_to_history(self, result, value=None, from_unit=None, to_unit=None, conversion_type=None):
+        now = datetime.now()
         item = {
             'formatted': result['formatted'],
-            'type': self.current_conversion_type,
-            'timestamp': datetime.now().strftime("%H:%M:%S"),
+            'type': conversion_type or self.current_conversion_type,
+            'timestamp': now.strftime("%H:%M:%S"),
+            'created_at': now.isoformat(timespec="seconds"),
+            'value': value,
+            'from_unit': from_unit,
+            'to_unit': to_unit,
+            'result': float(result['result']),
         }
-        self.conversion_history.insert(0, item)
-        if len(self.conversion_history) > 20:
-            self.conversion_history = self.conversion_history[:20]
-        self.update_recent_list()
+        self.recent_model.insert_entry(item)
+        if self.history_db is not None:
+            self.history_db.append(item)
 
     def update_recent_list(self):
-        self.recent_list.clear()
-        for item in self.conversion_history[:5]:
-            self.recent_list.addItem(f"[{item['timestamp']}] {item['formatted']}")
+        self.recent_model.set_history(self.conversion_history)
 
     def clear_result(self):
         self.result_label.setText("Enter values to see result")
@@ -395,12 +437,14 @@ class ProfessionalUnitConverter(QMainWindow):
         with open(filename, 'w') as f:
             json.dump({'timestamp': datetime.now().isoformat(),
                        'conversion_type': self.current_conversion_type,
-                       'result': self.last_result}, f, indent=2)
+                       'result': dict(self.last_result)}, f, indent=2)
         QMessageBox.information(self, "Success", f"Result saved to {filename}")
         self.set_status(f"[Status] Result saved to {filename}")
 
     def open_history(self):
-        HistoryDialog(self.conversion_history, self).exec_()
+        HistoryDialog(self.conversion_history, self, database=self.history_db,
+                      export=self.export_history).exec_()
+        self.update_recent_list()
         self.set_status("[Status] History dialog opened...")
 
     def export_history(self):
@@ -408,16 +452,12 @@ class ProfessionalUnitConverter(QMainWindow):
             QMessageBox.warning(self, "Warning", "No history to export!")
             self.set_status("[Status] Export failed: no history")
             return
-        filename, _ = QFileDialog.getSaveFileName(
-            self, "Export History",
-            f"conversion_history_{datetime.now().strftime('%Y%m%d')}.json",
-            "JSON Files (*.json)"
+        self.export_worker = start_history_export(
+            self, self.history_db, self.conversion_history,
+            on_finished=lambda message: self.set_status(f"[Status] {message.splitlines()[0]}")
         )
-        if filename:
-            with open(filename, 'w') as f:
-                json.dump(self.conversion_history, f, indent=2, default=str)
-            QMessageBox.information(self, "Success", f"History exported to {filename}")
-            self.set_status(f"[Status] History exported to {filename}")
+        if self.export_worker is not None:
+            self.set_status("[Status] Exporting history...")
 
     def swap_units(self):
         from_index = self.from_unit_combo.currentIndex()
@@ -478,14 +518,24 @@ class ProfessionalUnitConverter(QMainWindow):
         if geometry:
             self.restoreGeometry(geometry)
         history_data = self.settings.value("conversion_history", [])
-        if history_data:
-            self.conversion_history = history_data
-            self.update_recent_list()
+        if self.history_db is None:
+            self.conversion_history.load(history_data or [])
+        else:
+            if history_data:
+                # One-time migration of the history previously stored in QSettings
+                self.history_db.import_entries(history_data)
+                self.history_db.flush()
+                self.settings.remove("conversion_history")
+            self.conversion_history.load(self.history_db.recent(min(DEFAULT_PAGE_SIZE, HISTORY_CAPACITY)))
+        self.update_recent_list()
 
     def save_settings(self):
         self.settings.setValue("dark_mode", self.dark_mode)
         self.settings.setValue("geometry", self.saveGeometry())
-        self.settings.setValue("conversion_history", self.conversion_history)
+        if self.history_db is None:
+            self.settings.setValue("conversion_history", self.conversion_history.to_list())
+        else:
+            self.history_db.flush()
 
         # -------------------- Close Event -------------------- #
 
@@ -495,6 +545,11 @@ class ProfessionalUnitConverter(QMainWindow):
                                      "Do you really want to quit?",
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
+            if self.export_worker is not None and self.export_worker.isRunning():
+                self.export_worker.cancel()
+                self.export_worker.wait()
+            if self.history_db is not None:
+                self.history_db.close()
             event.accept()
         else:
             event.ignore()